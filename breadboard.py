@@ -6,7 +6,9 @@ for breadboards with 830 and 1260 points. Additionally, it provides a method for
 on the canvas.
 """
 
+from functools import lru_cache
 from tkinter import Canvas
+from types import MappingProxyType
 
 from component_sketch import ComponentSketcher
 from dataCDLT import (
@@ -18,6 +20,28 @@ from dataCDLT import (
 )
 
 
+_BOARD830_ORIGIN = MappingProxyType({"id_origin": "bboard830"})
+_CIRCUIT_ORIGIN = MappingProxyType({"id_origin": "circTest"})
+_GO_F_LEFT = MappingProxyType({"line": 5.5, "column": 0.5, "id_origin": "bboard830"})
+_GO_F_RIGHT = MappingProxyType({"line": 5.5, "column": 64.5, "id_origin": "bboard830"})
+_GO_A_LEFT = MappingProxyType({"line": 12.5, "column": 0.5, "id_origin": "bboard830"})
+_GO_A_RIGHT = MappingProxyType({"line": 12.5, "column": 64.5, "id_origin": "bboard830"})
+_GO_BOTTOM_NUMBERING = MappingProxyType({"line": 18.8, "column": 0.5, "id_origin": "bboard830"})
+_GO_BOTTOM_POWER = MappingProxyType({"line": 18.5, "column": 0.5, "id_origin": "bboard830"})
+_GO_CIRCUIT_START = MappingProxyType({"line": 10.1, "column": 1.4, "id_origin": "circTest"})
+_GO_CIRCUIT_ORIGIN = MappingProxyType({"line": 0, "column": 0, "id_origin": "circTest"})
+"""Read-only positioning parameters of the blank board model, shared by every sketcher."""
+
+_MINUS_CHAR = MappingProxyType({"deltaY": 1.3, "scaleChar": 2})
+_PLUS_CHAR = MappingProxyType({"color": "#ff0000", "text": "+", "deltaY": -0.6, "scaleChar": 2})
+_NUMBERING = MappingProxyType({"beginNum": 1, "endNum": 63, "direction": HORIZONTAL, "deltaY": -1.5})
+"""Read-only label styles of the power rails and column numbering."""
+
+_H = MappingProxyType({"direction": HORIZONTAL})
+_V = MappingProxyType({"direction": VERTICAL})
+"""Shared direction-only step parameters."""
+
+
 class Breadboard:
     """
     A class to represent a breadboard for circuit design.
@@ -29,6 +53,8 @@ class Breadboard:
         The ComponentSketcher instance used to draw the circuit.
     """
 
+    __slots__ = ("canvas", "sketcher")
+
     def __init__(self, canvas: Canvas, sketcher: ComponentSketcher):
         self.canvas = canvas
         self.sketcher = sketcher
@@ -121,6 +147,10 @@ class Breadboard:
                     "link": [(c + col_distance, 7 + line_distance, c + col_distance, 11 + line_distance)],
                 }
 
+        xy_table = self.sketcher.xy_table
+        for point in matrix.values():
+            xy_table[point["coord"]] = point["xy"]
+
     def fill_matrix_1260_pts(self):
         """
         Fills a 1260-point matrix by calling the fill_matrix_830_pts method twice.
@@ -161,69 +191,9 @@ class Breadboard:
         """
         Draws a blank breadboard model on the canvas.
         """
-        line_distribution = [(self.sketcher.draw_hole, 63)]
-        power_block = [(self.sketcher.draw_hole, 5), (self.sketcher.draw_blank, 1)]
-        neg_power_rail = [
-            (self.sketcher.draw_blank, 1),
-            (self.sketcher.draw_char, 1, {"deltaY": 1.3, "scaleChar": 2}),
-            (self.sketcher.draw_rail, 60),
-            (self.sketcher.draw_half_blank, 1),
-            (self.sketcher.draw_blank, 1),
-            (self.sketcher.draw_char, 1, {"deltaY": 1.3, "scaleChar": 2}),
-        ]
-        pos_power_rail = [
-            (self.sketcher.draw_blank, 1),
-            (self.sketcher.draw_char, 1, {"color": "#ff0000", "text": "+", "deltaY": -0.6, "scaleChar": 2}),
-            (self.sketcher.draw_red_rail, 60),
-            (self.sketcher.draw_blank, 1),
-            (self.sketcher.draw_half_blank, 1),
-            (self.sketcher.draw_char, 1, {"color": "#ff0000", "text": "+", "deltaY": -0.6, "scaleChar": 2}),
-        ]
-        power_line = [(self.sketcher.draw_blank, 3), (power_block, 10, {"direction": HORIZONTAL})]
-        power_strip = [
-            (neg_power_rail, 1, {"direction": VERTICAL}),
-            (power_line, 2, {"direction": VERTICAL}),
-            (pos_power_rail, 1, {"direction": VERTICAL}),
-        ]
-        strip_distribution = [(line_distribution, 5, {"direction": VERTICAL})]
-        numbering = [
-            (self.sketcher.draw_blank, 1),
-            (self.sketcher.draw_num_iter, 1, {"beginNum": 1, "endNum": 63, "direction": HORIZONTAL, "deltaY": -1.5}),
-        ]
-
-        board830pts = [
-            (self.sketcher.set_xy_origin, 1, {"id_origin": "bboard830"}),
-            (self.sketcher.draw_board, 1),
-            (self.sketcher.draw_half_blank, 1, {"direction": HORIZONTAL}),
-            (self.sketcher.draw_half_blank, 1, {"direction": VERTICAL}),
-            (power_strip, 1, {"direction": VERTICAL}),
-            (numbering, 1, {"direction": VERTICAL}),
-            (self.sketcher.go_xy, 1, {"line": 5.5, "column": 0.5, "id_origin": "bboard830"}),
-            (self.sketcher.draw_char_iter, 1, {"beginChar": "f", "numChars": 5, "anchor": "center", "deltaY": 0.7}),
-            (strip_distribution, 1, {"direction": VERTICAL}),
-            (self.sketcher.go_xy, 1, {"line": 5.5, "column": 64.5, "id_origin": "bboard830"}),
-            (self.sketcher.draw_half_blank, 1),
-            (self.sketcher.draw_char_iter, 1, {"beginChar": "f", "numChars": 5, "direction": VERTICAL, "deltaY": 0.7}),
-            (self.sketcher.go_xy, 1, {"line": 12.5, "column": 0.5, "id_origin": "bboard830"}),
-            (self.sketcher.draw_char_iter, 1, {"beginChar": "a", "numChars": 5, "deltaY": 0.7}),
-            (strip_distribution, 1, {"direction": VERTICAL}),
-            (self.sketcher.go_xy, 1, {"line": 12.5, "column": 64.5, "id_origin": "bboard830"}),
-            (self.sketcher.draw_half_blank, 1),
-            (self.sketcher.draw_char_iter, 1, {"beginChar": "a", "numChars": 5, "direction": VERTICAL, "deltaY": 0.7}),
-            (self.sketcher.go_xy, 1, {"line": 18.8, "column": 0.5, "id_origin": "bboard830"}),
-            (numbering, 1, {"direction": VERTICAL}),
-            (self.sketcher.go_xy, 1, {"line": 18.5, "column": 0.5, "id_origin": "bboard830"}),
-            (power_strip, 1, {"direction": VERTICAL}),
-        ]
-
-        board1260pts = [(board830pts, 2, {"direction": PERSO, "dXY": (0, 1.3)})]
-        blank_board_model = [
-            (self.sketcher.set_xy_origin, 1, {"id_origin": "circTest"}),
-            (board1260pts, 1),
-            (self.sketcher.go_xy, 1, {"line": 10.1, "column": 1.4, "id_origin": "circTest"}),
-            (self.sketcher.go_xy, 1, {"line": 0, "column": 0, "id_origin": "circTest"}),
-        ]
-        self.sketcher.circuit(x_origin, y_origin, scale=self.sketcher.scale_factor, model=blank_board_model)
+        self.sketcher.circuit(
+            x_origin, y_origin, scale=self.sketcher.scale_factor, model=build_blank_board_model(self.sketcher)
+        )
 
         battery_x = x_origin + 1050  # Adjust as needed for proper positioning
         battery_y = y_origin + 300   # Adjust as needed for proper positioning
@@ -244,4 +214,84 @@ class Breadboard:
             col, line = nearest_point_coord
             self.sketcher.matrix[f'{col},{line}']['state'] = USED
 
-        
\ No newline at end of file
+        
+
+
+@lru_cache(maxsize=4)
+def build_blank_board_model(sketcher: ComponentSketcher) -> tuple:
+    """
+    Builds the model of a blank 1260-point breadboard for the given sketcher.
+    The model only holds the sketcher's drawing methods and constant parameters, so it is built once per sketcher
+    and reused every time the board is redrawn.
+    """
+    draw_blank = sketcher.draw_blank
+    draw_half_blank = sketcher.draw_half_blank
+    draw_hole = sketcher.draw_hole
+    draw_char = sketcher.draw_char
+    draw_char_iter = sketcher.draw_char_iter
+    go_xy = sketcher.go_xy
+    set_xy_origin = sketcher.set_xy_origin
+
+    line_distribution = ((draw_hole, 63),)
+    power_block = ((draw_hole, 5), (draw_blank, 1))
+    neg_power_rail = (
+        (draw_blank, 1),
+        (draw_char, 1, _MINUS_CHAR),
+        (sketcher.draw_rail, 60),
+        (draw_half_blank, 1),
+        (draw_blank, 1),
+        (draw_char, 1, _MINUS_CHAR),
+    )
+    pos_power_rail = (
+        (draw_blank, 1),
+        (draw_char, 1, _PLUS_CHAR),
+        (sketcher.draw_red_rail, 60),
+        (draw_blank, 1),
+        (draw_half_blank, 1),
+        (draw_char, 1, _PLUS_CHAR),
+    )
+    power_line = ((draw_blank, 3), (power_block, 10, _H))
+    power_strip = (
+        (neg_power_rail, 1, _V),
+        (power_line, 2, _V),
+        (pos_power_rail, 1, _V),
+    )
+    strip_distribution = ((line_distribution, 5, _V),)
+    numbering = (
+        (draw_blank, 1),
+        (sketcher.draw_num_iter, 1, _NUMBERING),
+    )
+
+    board830pts = (
+        (set_xy_origin, 1, _BOARD830_ORIGIN),
+        (sketcher.draw_board, 1),
+        (draw_half_blank, 1, _H),
+        (draw_half_blank, 1, _V),
+        (power_strip, 1, _V),
+        (numbering, 1, _V),
+        (go_xy, 1, _GO_F_LEFT),
+        (draw_char_iter, 1, {"beginChar": "f", "numChars": 5, "anchor": "center", "deltaY": 0.7}),
+        (strip_distribution, 1, _V),
+        (go_xy, 1, _GO_F_RIGHT),
+        (draw_half_blank, 1),
+        (draw_char_iter, 1, {"beginChar": "f", "numChars": 5, "direction": VERTICAL, "deltaY": 0.7}),
+        (go_xy, 1, _GO_A_LEFT),
+        (draw_char_iter, 1, {"beginChar": "a", "numChars": 5, "deltaY": 0.7}),
+        (strip_distribution, 1, _V),
+        (go_xy, 1, _GO_A_RIGHT),
+        (draw_half_blank, 1),
+        (draw_char_iter, 1, {"beginChar": "a", "numChars": 5, "direction": VERTICAL, "deltaY": 0.7}),
+        (go_xy, 1, _GO_BOTTOM_NUMBERING),
+        (numbering, 1, _V),
+        (go_xy, 1, _GO_BOTTOM_POWER),
+        (power_strip, 1, _V),
+    )
+
+    board1260pts = ((board830pts, 2, {"direction": PERSO, "dXY": (0, 1.3)}),)
+    blank_board_model = (
+        (set_xy_origin, 1, _CIRCUIT_ORIGIN),
+        (board1260pts, 1),
+        (go_xy, 1, _GO_CIRCUIT_START),
+        (go_xy, 1, _GO_CIRCUIT_ORIGIN),
+    )
+    return blank_board_model
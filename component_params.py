@@ -1,2 +1,26 @@
+from types import MappingProxyType
+
 BOARD_830_PTS_PARAMS = {"dimLine": 66, "dimColumn": 22, "sepAlim": [(0, 4), (0, 18.5)], "sepDistribution": [(0, 10.7)]}
 DIP14_PARAMS = {"pinCount": 14, "chipWidth": 2.4, "label": "DIP 14", "type": "DIP14"}
+DIP_CHIP_DEFAULTS = MappingProxyType(
+    {
+        **DIP14_PARAMS,
+        "internalFunc": None,
+        "io_select": None,
+        "io_out_inv": None,
+        "io_enable": None,
+        "io_enable_inv": None,
+        "clock_pin": None,
+        "inv_clock_pin": None,
+        "inv_reset_pin": None,
+        "inv_set_pin": None,
+        "j_input_pin": None,
+        "inv_k_input_pin": None,
+        "k_input_pin": None,
+        "count_enable_pin": None,
+        "inv_load_enable_pin": None,
+        "inv_up_down_input_pin": None,
+        "terminal_count_pin": None,
+        "pwr": None,
+    }
+)
@@ -5,6 +5,8 @@ a Tkinter canvas. It includes methods for drawing various components such as chi
 well as handling events like dragging and clicking.
 """
 
+from collections import ChainMap
+from functools import lru_cache
 from pathlib import Path
 import tkinter as tk
 from tkinter import font
@@ -28,8 +30,65 @@ from dataCDLT import (
     OUTPUT,
     CLOCK,
 )
-from component_params import BOARD_830_PTS_PARAMS, DIP14_PARAMS
-from utils import resource_path
+from component_params import BOARD_830_PTS_PARAMS, DIP_CHIP_DEFAULTS
+from utils import resource_path, rgb_hex
+
+BTN_STATES = (("#808080", LEFT), ("#ff0000", LEFT), ("#00ff00", RIGHT))
+"""Menu switch (color, position) indexed by button state: 0 disabled, 1 off, 2 on."""
+
+
+@lru_cache(maxsize=64)
+def internal_pin_offsets(pin_count, chip_width, scale, pin_numbers):
+    """
+    Offsets (dx, dy, orientation) of the internal function symbols of a chip, relative to its origin.
+    Chips of the same type share the same offsets, so they are computed once per (pinCount, chipWidth, scale, pins).
+    """
+    space = 9 * scale
+    inter_space = 15 * scale
+    dim_column = chip_width * inter_space
+    offsets = []
+    for p in pin_numbers:
+        orientation = 1 - 2 * ((p - 1) * 2 // pin_count)
+        if p > pin_count // 2:
+            p = 15 - p
+        dx = 2 * scale + space // 2 + (p - 2) * inter_space + 3 * inter_space // 15
+        dy = dim_column // 2 + orientation * 0.2 * inter_space
+        offsets.append((dx, dy, orientation))
+    return tuple(offsets)
+
+
+@lru_cache(maxsize=64)
+def chip_pin_shapes(pin_count, chip_width, scale):
+    """
+    Pin rectangle and polygon coordinates of a DIP chip, relative to its origin.
+    The geometry only depends on (pinCount, chipWidth, scale), so it is computed once per chip shape.
+    """
+    space = 9 * scale
+    inter_space = 15 * scale
+    dim_column = chip_width * inter_space
+    num_pins_per_side = pin_count // 2
+    shapes = []
+    for i in range(pin_count):
+        side, pos = divmod(i, num_pins_per_side)
+        pin_x = 2 * scale + pos * inter_space
+        rect = (
+            pin_x,
+            side * dim_column,
+            11 * scale + pos * inter_space,
+            side * (dim_column + 6 * scale) - 3 * scale,
+        )
+        poly = (
+            pin_x,
+            side * (dim_column + 2 * space // 3) - space // 3,
+            pin_x + space // 3,
+            side * (dim_column + (4 * space) // 3) - (2 * space) // 3,
+            pin_x + (2 * space) // 3,
+            side * (dim_column + (4 * space) // 3) - (2 * space) // 3,
+            (11 + pos * 15) * scale,
+            side * (dim_column + 2 * space // 3) - space // 3,
+        )
+        shapes.append((rect, poly))
+    return tuple(shapes)
 
 
 class ComponentSketcher:
@@ -46,7 +105,13 @@ class ComponentSketcher:
     pin_io_drag_data (dict): Data related to the pin_io being dragged.
     delete_mode_active (bool): A flag to indicate if delete mode is active.
     drag_mouse (list): The current mouse position [x,y].
+    drag_menu_pending (tuple): Latest (tag, x, y) menu drag position waiting to be applied, or None.
+    item_state (dict): Last canvas state set through set_state, by tag.
+    open_menu (str): Tag of the chip menu currently shown, or None.
     id_type (dict): A dictionary to store the type of each ID.
+    xy_table (dict): (column, line) -> (x, y) lookup filled alongside the matrix, used by get_xy.
+    battery_images (dict): Battery images loaded on first draw, by scale.
+    pin_ios_by_type (dict): Pin_io params in current_dict_circuit, by pin type then id, in creation order.
     """
 
     def __init__(self, canvas) -> None:
@@ -66,9 +131,15 @@ class ComponentSketcher:
         self.pin_io_drag_data = {"pin_id": None, "x": 0, "y": 0}
         self.delete_mode_active = False
         self.drag_mouse = [0, 0]
+        self.drag_menu_pending: tuple[str, int, int] | None = None
+        self.item_state: dict[str, str] = {}
+        self.open_menu: str | None = None
         self.id_type: dict[str, int] = {}
         self.current_dict_circuit: dict[str, Any] = {}
         self.matrix: dict[str, Any] = {}
+        self.xy_table: dict[tuple[int, int], tuple[float, float]] = {}
+        self.battery_images: dict[float, tk.PhotoImage] = {}
+        self.pin_ios_by_type: dict[int, dict[str, dict]] = {INPUT: {}, OUTPUT: {}, CLOCK: {}}
         self.id_origins = {"xyOrigin": (0, 0)}
         self.battery_wire_drag_data: dict[str, Any] = {}
 
@@ -83,7 +154,7 @@ class ComponentSketcher:
         - direction (str, optional): Direction of the circuit layout. Can be VERTICAL, HORIZONTAL, or PERSO.
                                      Defaults to VERTICAL.
         - **kwargs: Additional keyword arguments:
-            - model (list, optional): Custom model for the circuit layout. Defaults to line_distribution.
+            - model (list or tuple, optional): Custom model for the circuit layout. Defaults to line_distribution.
             - dXY (tuple, optional): Custom x and y distances for PERSO direction.
         Returns:
         - tuple: Updated x_distance and y_distance after laying out the circuit.
@@ -95,23 +166,20 @@ class ComponentSketcher:
             scale = width / 9.0
         inter_space = 15 * scale
 
-        model = kwargs.get("model", [(self.draw_hole, 1)])
+        model = kwargs.get("model", ((self.draw_hole, 1),))
         _, delta_y = kwargs.get("dXY", (0, 1))
 
         x, y = x_distance, y_distance
         for element in model:
-            if callable(element[0]) and isinstance(element[1], int):
-                for _ in range(element[1]):
-                    if len(element) == 3:
-                        (x, y) = element[0](x, y, scale, width, **element[2])
-                    else:
-                        (x, y) = element[0](x, y, scale, width)
-            elif isinstance(element[0], list) and isinstance(element[1], int):
-                for _ in range(element[1]):
-                    if len(element) == 3:
-                        (x, y) = self.circuit(x, y, scale, width, model=element[0], **element[2])
-                    else:
-                        (x, y) = self.circuit(x, y, scale, width, model=element[0])
+            # Unpack the step once, not on every repetition
+            step, count = element[0], element[1]
+            params = element[2] if len(element) == 3 else {}
+            if callable(step) and isinstance(count, int):
+                for _ in range(count):
+                    (x, y) = step(x, y, scale, width, **params)
+            elif isinstance(step, (list, tuple)) and isinstance(count, int):
+                for _ in range(count):
+                    (x, y) = self.circuit(x, y, scale, width, model=step, **params)
             else:
                 raise ValueError(
                     "The rail model argument must be a tuple (function(), int, [int]) or (list, int, [int])."
@@ -162,7 +230,7 @@ class ComponentSketcher:
             else:
                 coord = [(coord[0][0], coord[0][1], cn, ln)]
 
-            model_wire = [
+            model_wire = (
                 (
                     self.draw_wire,
                     1,
@@ -173,8 +241,8 @@ class ComponentSketcher:
                         "multipoints": multipoints,
                         "matrix": self.matrix,
                     },
-                )
-            ]
+                ),
+            )
             self.circuit(x_o, y_o, model=model_wire)
 
     def on_wire_endpoint_release(self, _, wire_id, endpoint):
@@ -230,9 +298,9 @@ class ComponentSketcher:
             (_, _), (col, line) = self.find_nearest_grid_wire(x, y)
             coord = [(coord[0][0], coord[0][1], col, line)]
 
-        model_wire = [
-            (self.draw_wire, 1, {"id": wire_id, "color": color, "coord": coord, "XY": xy, "matrix": self.matrix})
-        ]
+        model_wire = (
+            (self.draw_wire, 1, {"id": wire_id, "color": color, "coord": coord, "XY": xy, "matrix": self.matrix}),
+        )
 
         self.circuit(self.id_origins["xyOrigin"], model=model_wire)
 
@@ -316,7 +384,8 @@ class ComponentSketcher:
             i = 0
             while nearest_point == -1 and i < len(multipoint):
                 dx, dy = multipoint[i] - x1, multipoint[i + 1] - y1
-                t = max(0, min(1, ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)))
+                seg_len_sq = dx * dx + dy * dy
+                t = max(0, min(1, ((x - x1) * dx + (y - y1) * dy) / seg_len_sq)) if seg_len_sq else 0
                 proj_x = x1 + t * dx
                 proj_y = y1 + t * dy
                 dist_segment = math.hypot(x - proj_x, y - proj_y)
@@ -336,8 +405,8 @@ class ComponentSketcher:
         """
         if not self.drag_selector and not self.delete_mode_active and not self.wire_drag_data["creating_wire"]:
             color = self.current_dict_circuit[wire_id]["color"]
-            encre = f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
-            contour = f"#{color[0]//2:02x}{color[1]//2:02x}{color[2]//2:02x}"
+            encre = rgb_hex(color[0], color[1], color[2])
+            contour = rgb_hex(color[0] // 2, color[1] // 2, color[2] // 2)
             self.canvas.config(cursor=f"dot {encre} {contour}")
 
     def on_wire_body_leave(self, *_):
@@ -365,8 +434,8 @@ class ComponentSketcher:
             endpoint_tag = "selector_cable"
 
             color = self.current_dict_circuit[wire_id]["color"]
-            encre = f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
-            contour = f"#{color[0]//2:02x}{color[1]//2:02x}{color[2]//2:02x}"
+            encre = rgb_hex(color[0], color[1], color[2])
+            contour = rgb_hex(color[0] // 2, color[1] // 2, color[2] // 2)
             self.canvas.itemconfig(endpoint_tag, outline=contour, fill=encre)
             if insert_point:
                 multipoints = self.current_dict_circuit[wire_id]["multipoints"]
@@ -390,7 +459,7 @@ class ComponentSketcher:
             multipoints.pop(self.nearest_multipoint)
             multipoints.pop(self.nearest_multipoint)
             self.current_dict_circuit[wire_id]["multipoints"] = multipoints
-            model_wire = [
+            model_wire = (
                 (
                     self.draw_wire,
                     1,
@@ -402,8 +471,8 @@ class ComponentSketcher:
                         "XY": [self.current_dict_circuit[wire_id]["XY"]],
                         "matrix": self.matrix,
                     },
-                )
-            ]
+                ),
+            )
             self.circuit(x_o, y_o, model=model_wire)
 
     def delete_wire(self, wire_id):
@@ -441,7 +510,7 @@ class ComponentSketcher:
         multipoints[self.nearest_multipoint] = x
         multipoints[self.nearest_multipoint + 1] = y
 
-        model_wire = [
+        model_wire = (
             (
                 self.draw_wire,
                 1,
@@ -453,8 +522,8 @@ class ComponentSketcher:
                     "XY": xy,
                     "matrix": self.matrix,
                 },
-            )
-        ]
+            ),
+        )
         self.circuit(x_o, y_o, model=model_wire)
 
     def on_wire_body_release(self, *_):
@@ -514,6 +583,10 @@ class ComponentSketcher:
         chip_params = self.current_dict_circuit[chip_id]
         for tag in chip_params["tags"]:
             self.canvas.delete(tag)
+        self.item_state.pop(f"chipCover{chip_id}", None)
+        self.item_state.pop(f"menu{chip_id}", None)
+        if self.open_menu == f"menu{chip_id}":
+            self.open_menu = None
 
         # Restore occupied holes
         for hole_id in chip_params["occupied_holes"]:
@@ -554,7 +627,7 @@ class ComponentSketcher:
             current_x, current_y = chip_params["XY"]
             # chip_params["XY"] = (current_x + dx, current_y + dy)
 
-            model_chip = [(self.draw_chip, 1, {"id": chip_id, "XY": (current_x + dx, current_y + dy)})]
+            model_chip = ((self.draw_chip, 1, {"id": chip_id, "XY": (current_x + dx, current_y + dy)}),)
             self.circuit(current_x + dx, current_y + dy, model=model_chip)
 
             print(f"Chip {chip_id} moved to new position: ({current_x}, {current_y})")
@@ -626,7 +699,7 @@ class ComponentSketcher:
                 chip_params["occupied_holes"] = occupied_holes
 
             pin_x, pin_y = self.xy_chip2pin(real_x, real_y)
-            model_chip = [(self.draw_chip, 1, {"id": chip_id, "XY": (real_x, real_y), "pinUL_XY": (pin_x, pin_y)})]
+            model_chip = ((self.draw_chip, 1, {"id": chip_id, "XY": (real_x, real_y), "pinUL_XY": (pin_x, pin_y)}),)
             self.circuit(real_x, real_y, model=model_chip)
             # Reset drag_chip_data
             self.drag_chip_data["chip_id"] = None
@@ -769,6 +842,7 @@ class ComponentSketcher:
 
         # Delete the pin_io from the dictionary
         del self.current_dict_circuit[pin_id]
+        self.pin_ios_by_type.get(pin_io_params["type"], {}).pop(pin_id, None)
         # TODO Khalid update the Circuit instance
         print(f"Pin_io {pin_id} deleted")
 
@@ -791,7 +865,7 @@ class ComponentSketcher:
             if self.matrix[f"{col},{line}"]["state"] == FREE:
 
                 self.matrix[f"{coord[0][0]},{coord[0][1]}"]["state"] = FREE
-                model_pin_io = [(self.draw_pin_io, 1, {"id": pin_id, "coord": [(col, line)], "matrix": self.matrix})]
+                model_pin_io = ((self.draw_pin_io, 1, {"id": pin_id, "coord": [(col, line)], "matrix": self.matrix}),)
                 self.circuit(x_o, y_o, model=model_pin_io)
 
     def on_pin_io_release(self, _, pin_id):
@@ -1180,12 +1254,10 @@ class ComponentSketcher:
         inter_space = 15 * scale
         thickness = 1 * scale
 
-        dim = BOARD_830_PTS_PARAMS.copy()
-        dim["dimLine"] = kwargs.get("dimLine", dim["dimLine"])
-        dim["dimColumn"] = kwargs.get("dimColumn", dim["dimColumn"])
+        dim = ChainMap(kwargs, BOARD_830_PTS_PARAMS)
         color = kwargs.get("color", "#F5F5DC")
-        sep_alim = kwargs.get("sepAlim", dim["sepAlim"])
-        sep_distrib = kwargs.get("sepDistribution", dim["sepDistribution"])
+        sep_alim = dim["sepAlim"]
+        sep_distrib = dim["sepDistribution"]
         radius = kwargs.get("radius", 5)
 
         thickness = 1 * scale
@@ -1393,31 +1465,29 @@ class ComponentSketcher:
         if width != -1:
             scale = width / 9.0
 
-        inter_space = 15 * scale
-
         tag = kwargs.get("tags", "")
         color = kwargs.get("color", "#ffffff")
 
-        self.canvas.create_rectangle(
-            x_distance,
-            y_distance,
-            x_distance + 4 * inter_space // 15,
-            y_distance + orientation * 4 * inter_space // 15,
-            fill=color,
-            outline=color,
-            tags=tag,
-        )
-        self.canvas.create_polygon(
-            x_distance,
-            y_distance + orientation * 4 * inter_space // 15,
-            x_distance + 4 * inter_space // 15,
-            y_distance + orientation * 4 * inter_space // 15,
-            x_distance + 2 * inter_space // 15,
-            y_distance + orientation * 7 * inter_space // 15,
-            fill=color,
-            outline=color,
-            tags=tag,
-        )
+        self.draw_label_pins([(x_distance, y_distance, color)], scale=scale, orientation=orientation, tags=tag)
+
+    def draw_label_pins(self, pins, scale=1, orientation=1, tags=""):
+        """
+        Draw several label pins sharing the same scale, orientation and tags.
+        pins is a list of (x, y, color) tuples.
+        """
+        inter_space = 15 * scale
+        dx_2 = 2 * inter_space // 15
+        dx_4 = 4 * inter_space // 15
+        dy_4 = orientation * 4 * inter_space // 15
+        dy_7 = orientation * 7 * inter_space // 15
+        create_rectangle = self.canvas.create_rectangle
+        create_polygon = self.canvas.create_polygon
+
+        for x, y, color in pins:
+            create_rectangle(x, y, x + dx_4, y + dy_4, fill=color, outline=color, tags=tags)
+            create_polygon(
+                x, y + dy_4, x + dx_4, y + dy_4, x + dx_2, y + dy_7, fill=color, outline=color, tags=tags
+            )
 
     def draw_symb(self, logic_fn_name: str) -> Callable | None:
         """
@@ -1744,24 +1814,24 @@ class ComponentSketcher:
         if width != -1:
             scale = width / 9.0
 
-        space = 9 * scale
-        inter_space = 15 * scale
         logic_function = kwargs.get("logicFunction", None)
         io = kwargs.get("io", [])
         pin_count = kwargs.get("pinCount", 14)
         chip_width = kwargs.get("chipWidth", 2.4)
-        dim_column = chip_width * inter_space
 
         if logic_function is None:
             return
-        for pin in io:
-            p = pin[1][0]
-            orientation = 1 - 2 * ((p - 1) * 2 // pin_count)
-            if p > pin_count // 2:
-                p = 15 - p
-            x = x_distance + 2 * scale + space // 2 + (p - 2) * inter_space + 3 * inter_space // 15
-            y = y_distance + dim_column // 2 + orientation * 0.2 * inter_space
-            logic_function(x, y, scale=scale, width=width, direction=direction, orientation=orientation, **kwargs)
+        pin_numbers = tuple(pin[1][0] for pin in io)
+        for dx, dy, orientation in internal_pin_offsets(pin_count, chip_width, scale, pin_numbers):
+            logic_function(
+                x_distance + dx,
+                y_distance + dy,
+                scale=scale,
+                width=width,
+                direction=direction,
+                orientation=orientation,
+                **kwargs,
+            )
 
     def on_switch(self, _, tag, element_id, num_btn):
         """
@@ -1769,20 +1839,14 @@ class ComponentSketcher:
         """
         params = self.current_dict_circuit.get(element_id)
         if params:
-            btn = params["btnMenu"][num_btn - 1]
+            btn_menu = params["btnMenu"]
+            btn = btn_menu[num_btn - 1]
             if btn > 0:
-                btn = abs(btn - 2) + 1
-                params["btnMenu"][num_btn - 1] = btn
-                if btn == 1:
-                    color = "#ff0000"
-                    pos = LEFT
-                    if num_btn == 1:
-                        self.canvas.itemconfig("chipCover" + element_id, state="normal")
-                else:
-                    color = "#00ff00"
-                    pos = RIGHT
-                    if num_btn == 1:
-                        self.canvas.itemconfig("chipCover" + element_id, state="hidden")
+                btn = 2 if btn == 1 else 1
+                btn_menu[num_btn - 1] = btn
+                color, pos = BTN_STATES[btn]
+                if num_btn == 1:
+                    self.set_state(f"chipCover{element_id}", "normal" if btn == 1 else "hidden")
                 self.canvas.move(tag, pos * 40 - 20, 0)
                 self.canvas.itemconfig(tag, fill=color)
 
@@ -1796,17 +1860,19 @@ class ComponentSketcher:
         pos_switch=LEFT,
         tag=None,
         num_btn=1,
+        menu_tags=(),
     ):
         """
         Draw a switch at the given coordinates.
         """
+        tags = (*menu_tags, tag)
         self.canvas.create_arc(
-            x1, y1, x1 + 20, y1 + 20, start=90, extent=180, fill=fill_support, outline=fill_support, tags=tag
+            x1, y1, x1 + 20, y1 + 20, start=90, extent=180, fill=fill_support, outline=fill_support, tags=tags
         )
         self.canvas.create_arc(
-            x1 + 20, y1, x1 + 40, y1 + 20, start=270, extent=180, fill=fill_support, outline=fill_support, tags=tag
+            x1 + 20, y1, x1 + 40, y1 + 20, start=270, extent=180, fill=fill_support, outline=fill_support, tags=tags
         )
-        self.canvas.create_rectangle(x1 + 10, y1, x1 + 30, y1 + 20, fill=fill_support, outline=fill_support, tags=tag)
+        self.canvas.create_rectangle(x1 + 10, y1, x1 + 30, y1 + 20, fill=fill_support, outline=fill_support, tags=tags)
         self.canvas.create_oval(
             x1 + 3 + pos_switch * 20,
             y1 + 3,
@@ -1814,16 +1880,29 @@ class ComponentSketcher:
             y1 + 17,
             fill=fill_switch,
             outline=out_switch,
-            tags="btn" + str(num_btn) + "_" + tag,
+            tags=(*tags, f"btn{num_btn}_{tag}"),
         )
-        self.canvas.addtag_withtag(tag, "btn" + str(num_btn) + "_" + tag)
 
     def on_drag_menu(self, event, tag):
         """
         Handle the drag of the menu.
+        Motion events are coalesced: only the latest position is applied, once per idle cycle.
         """
-        self.canvas.move(tag, event.x - self.drag_mouse[0], event.y - self.drag_mouse[1])
-        self.drag_mouse[0], self.drag_mouse[1] = event.x, event.y
+        pending = self.drag_menu_pending is not None
+        self.drag_menu_pending = (tag, event.x, event.y)
+        if not pending:
+            self.canvas.after_idle(self.flush_drag_menu)
+
+    def flush_drag_menu(self):
+        """
+        Move the dragged menu to the latest pointer position recorded by on_drag_menu.
+        """
+        if self.drag_menu_pending is None:
+            return
+        tag, x, y = self.drag_menu_pending
+        self.drag_menu_pending = None
+        self.canvas.move(tag, x - self.drag_mouse[0], y - self.drag_mouse[1])
+        self.drag_mouse[0], self.drag_mouse[1] = x, y
 
     def on_start_drag_menu(self, event, tag):
         """
@@ -1854,7 +1933,9 @@ class ComponentSketcher:
         """
         Handle the click on the cross over the menu.
         """
-        self.canvas.itemconfig(tag_menu, state="hidden")
+        self.set_state(tag_menu, "hidden")
+        if self.open_menu == tag_menu:
+            self.open_menu = None
         self.canvas.itemconfig(tag_ref, outline="")
 
     def draw_menu(self, x_menu, y_menu, thickness, label, tag, element_id):
@@ -1867,45 +1948,32 @@ class ComponentSketcher:
         params = self.current_dict_circuit.get(element_id)
         if params:
             [btn1, btn2, btn3] = params["btnMenu"]
-            if btn1 == 0:
-                color1 = "#808080"
-                pos1 = LEFT
-            elif btn1 == 1:
-                color1 = "#ff0000"
-                pos1 = LEFT
-            else:
-                color1 = "#00ff00"
-                pos1 = RIGHT
-            if btn2 == 0:
-                color2 = "#808080"
-                pos2 = LEFT
-            elif btn2 == 1:
-                color2 = "#ff0000"
-                pos2 = LEFT
-            else:
-                color2 = "#00ff00"
-                pos2 = RIGHT
-            if btn3 == 0:
-                color3 = "#808080"
-                pos3 = LEFT
-            elif btn3 == 1:
-                color3 = "#ff0000"
-                pos3 = LEFT
-            else:
-                color3 = "#00ff00"
-                pos3 = RIGHT
+            color1, pos1 = BTN_STATES[btn1]
+            color2, pos2 = BTN_STATES[btn2]
+            color3, pos3 = BTN_STATES[btn3]
+            switch_tag = "switch_" + tag
+            btn_tags = tuple(f"btn{num_btn}_{switch_tag}" for num_btn in (1, 2, 3))
+            # Every menu item carries the menu tag and "componentMenu" from creation on
+            menu_tags = (tag, "componentMenu")
+            tag_bind = self.canvas.tag_bind
 
             self.rounded_rect(
-                x_menu, y_menu, 128, 128, 10, outline=out_menu, fill=fill_menu, thickness=thickness, tags=tag
+                x_menu, y_menu, 128, 128, 10, outline=out_menu, fill=fill_menu, thickness=thickness, tags=menu_tags
             )
             self.canvas.create_rectangle(
-                x_menu, y_menu, x_menu + 114, y_menu + 17, fill="", outline="", tags="drag_" + tag
+                x_menu, y_menu, x_menu + 114, y_menu + 17, fill="", outline="", tags=(*menu_tags, "drag_" + tag)
             )
             self.canvas.create_line(
-                x_menu, y_menu + 17, x_menu + 127, y_menu + 17, fill=out_menu, width=thickness, tags=tag
+                x_menu, y_menu + 17, x_menu + 127, y_menu + 17, fill=out_menu, width=thickness, tags=menu_tags
             )
             self.canvas.create_rectangle(
-                x_menu + 110, y_menu + 1, x_menu + 125, y_menu + 16, fill="", outline="", tags="crossBg_" + tag
+                x_menu + 110,
+                y_menu + 1,
+                x_menu + 125,
+                y_menu + 16,
+                fill="",
+                outline="",
+                tags=(*menu_tags, "crossBg_" + tag),
             )
             self.canvas.create_line(
                 x_menu + 115,
@@ -1914,7 +1982,7 @@ class ComponentSketcher:
                 y_menu + 12,
                 fill=color_cross,
                 width=thickness * 2,
-                tags="cross_" + tag,
+                tags=(*menu_tags, "cross_" + tag),
             )
             self.canvas.create_line(
                 x_menu + 115,
@@ -1923,7 +1991,7 @@ class ComponentSketcher:
                 y_menu + 5,
                 fill=color_cross,
                 width=thickness * 2,
-                tags="cross_" + tag,
+                tags=(*menu_tags, "cross_" + tag),
             )
             self.draw_char(
                 x_menu + 63,
@@ -1933,73 +2001,106 @@ class ComponentSketcher:
                 text=label,
                 color="#ffffff",
                 anchor="center",
-                tags="title_" + tag,
+                tags=(*menu_tags, "title_" + tag),
             )
             self.draw_switch(
-                x_menu + 10, y_menu + 27, fill_switch=color1, pos_switch=pos1, tag="switch_" + tag, num_btn=1
-            )
-            self.canvas.tag_bind(
-                "btn1_switch_" + tag,
+                x_menu + 10,
+                y_menu + 27,
+                fill_switch=color1,
+                pos_switch=pos1,
+                tag=switch_tag,
+                num_btn=1,
+                menu_tags=menu_tags,
+            )
+            tag_bind(
+                btn_tags[0],
                 "<Button-1>",
-                lambda event: self.on_switch(event, "btn1_switch_" + tag, element_id, 1),
+                lambda event, btn_tag=btn_tags[0]: self.on_switch(event, btn_tag, element_id, 1),
             )
-            self.draw_aop(x_menu + 82, y_menu + 32, scale=2, color="#000000", tags=tag)
-            self.draw_aop(x_menu + 80, y_menu + 30, scale=2, tags=tag)
+            self.draw_aop(x_menu + 82, y_menu + 32, scale=2, color="#000000", tags=menu_tags)
+            self.draw_aop(x_menu + 80, y_menu + 30, scale=2, tags=menu_tags)
             self.draw_switch(
-                x_menu + 10, y_menu + 60, fill_switch=color2, pos_switch=pos2, tag="switch_" + tag, num_btn=2
-            )
-            self.canvas.tag_bind(
-                "btn2_switch_" + tag,
+                x_menu + 10,
+                y_menu + 60,
+                fill_switch=color2,
+                pos_switch=pos2,
+                tag=switch_tag,
+                num_btn=2,
+                menu_tags=menu_tags,
+            )
+            tag_bind(
+                btn_tags[1],
                 "<Button-1>",
-                lambda event: self.on_switch(event, "btn2_switch_" + tag, element_id, 2),
-            )
-            self.draw_label_pin(x_menu + 68, y_menu + 65, scale=2, color="#000000", tags=tag)
-            self.draw_label_pin(x_menu + 65, y_menu + 62, scale=2, color="#faa000", tags=tag)
-            self.draw_label_pin(x_menu + 88, y_menu + 65, scale=2, color="#000000", tags=tag)
-            self.draw_label_pin(x_menu + 85, y_menu + 62, scale=2, color="#faa000", tags=tag)
-            self.draw_label_pin(x_menu + 108, y_menu + 65, scale=2, color="#000000", tags=tag)
-            self.draw_label_pin(x_menu + 105, y_menu + 62, scale=2, color="#faa000", tags=tag)
+                lambda event, btn_tag=btn_tags[1]: self.on_switch(event, btn_tag, element_id, 2),
+            )
+            self.draw_label_pins(
+                [
+                    (x_menu + 68, y_menu + 65, "#000000"),
+                    (x_menu + 65, y_menu + 62, "#faa000"),
+                    (x_menu + 88, y_menu + 65, "#000000"),
+                    (x_menu + 85, y_menu + 62, "#faa000"),
+                    (x_menu + 108, y_menu + 65, "#000000"),
+                    (x_menu + 105, y_menu + 62, "#faa000"),
+                ],
+                scale=2,
+                tags=menu_tags,
+            )
             self.draw_switch(
-                x_menu + 10, y_menu + 93, fill_switch=color3, pos_switch=pos3, tag="switch_" + tag, num_btn=3
+                x_menu + 10,
+                y_menu + 93,
+                fill_switch=color3,
+                pos_switch=pos3,
+                tag=switch_tag,
+                num_btn=3,
+                menu_tags=menu_tags,
             )
 
-            self.canvas.tag_bind(
-                "btn3_switch_" + tag,
+            tag_bind(
+                btn_tags[2],
                 "<Button-1>",
-                lambda event: self.on_switch(event, "btn3_switch_" + tag, element_id, 3),
+                lambda event, btn_tag=btn_tags[2]: self.on_switch(event, btn_tag, element_id, 3),
             )
             self.canvas.tag_raise("drag_" + tag)
-            self.canvas.addtag_withtag(tag, "title_" + tag)
-            self.canvas.addtag_withtag(tag, "crossBg_" + tag)
-            self.canvas.addtag_withtag(tag, "cross_" + tag)
-            self.canvas.addtag_withtag(tag, "btn_" + tag)
-            self.canvas.addtag_withtag(tag, "drag_" + tag)
-            self.canvas.addtag_withtag(tag, "switch_" + tag)
-            self.canvas.addtag_withtag("componentMenu", tag)
-            self.canvas.tag_bind("drag_" + tag, "<B1-Motion>", lambda event: self.on_drag_menu(event, tag))
-            self.canvas.tag_bind(
+            tag_bind("drag_" + tag, "<B1-Motion>", lambda event: self.on_drag_menu(event, tag))
+            tag_bind(
                 "drag_" + tag, "<Button-1>", lambda event: self.on_start_drag_menu(event, "title_" + tag)
             )
-            self.canvas.tag_bind("cross_" + tag, "<Enter>", lambda event: self.on_cross_over(event, tag))
-            self.canvas.tag_bind("cross_" + tag, "<Leave>", lambda event: self.on_cross_leave(event, tag))
-            self.canvas.tag_bind(
-                "cross_" + tag, "<Button-1>", lambda event: self.on_cross_click(event, tag, "activeArea" + element_id)
+            tag_bind("cross_" + tag, "<Enter>", lambda event: self.on_cross_over(event, tag))
+            tag_bind("cross_" + tag, "<Leave>", lambda event: self.on_cross_leave(event, tag))
+            tag_bind(
+                "cross_" + tag, "<Button-1>", lambda event: self.on_cross_click(event, tag, f"activeArea{element_id}")
             )
-            self.canvas.tag_bind(
+            tag_bind(
                 "drag_" + tag, "<ButtonRelease-1>", lambda event: self.on_stop_drag_menu(event, "title_" + tag)
             )
-            self.canvas.itemconfig(tag, state="hidden")
+            self.set_state(tag, "hidden")
 
-    def on_menu(self, _, tag_menu, tag_all, tag_reg, color_out="#60d0ff"):
+    def on_menu(self, _, tag_menu, tag_all, tag_reg, color_out="#60d0ff", draw_menu=None):
         """
         Handle the menu.
+        The menu items are only created by draw_menu the first time the menu is opened.
         """
+        if draw_menu is not None and not self.canvas.find_withtag(tag_menu):
+            draw_menu()
         self.canvas.tag_raise(tag_menu)
-        self.canvas.itemconfig(tag_all, state="hidden")
-        self.canvas.itemconfig(tag_menu, state="normal")
+        # Only one menu is shown at a time: hiding the open one hides every item of tag_all
+        if self.open_menu is not None and self.open_menu != tag_menu:
+            self.set_state(self.open_menu, "hidden")
+        elif self.open_menu is None:
+            self.canvas.itemconfig(tag_all, state="hidden")
+        self.set_state(tag_menu, "normal")
+        self.open_menu = tag_menu
         self.canvas.itemconfig("componentActiveArea", outline="")
         self.canvas.itemconfig(tag_reg, outline=color_out)
 
+    def set_state(self, tag, state):
+        """
+        Set the canvas state of the items with the given tag, skipping the call if they are already in that state.
+        """
+        if self.item_state.get(tag) != state:
+            self.canvas.itemconfig(tag, state=state)
+            self.item_state[tag] = state
+
     def change_hole_state(self, col, line, pin_count, state):
         """
         Change the state of the holes at (col, line).
@@ -2018,30 +2119,8 @@ class ComponentSketcher:
         space = 9 * scale
         thickness = 1 * scale
 
-        dim = DIP14_PARAMS.copy()
-        dim["pinCount"] = kwargs.get("pinCount", dim["pinCount"])
-        dim["chipWidth"] = kwargs.get("chipWidth", dim["chipWidth"])
-        dim["label"] = kwargs.get("label", dim["label"])
-        dim["internalFunc"] = kwargs.get("internalFunc", None)
-        dim["io_select"] = kwargs.get("io_select", None)
-        # if not dim["io_select"] :
-        #     dim["io_select"]  = kwargs.get("address_pins", None)
-        dim["io_out_inv"] = kwargs.get("io_out_inv", None)
-        dim["io_enable"] = kwargs.get("io_enable", None)
-        dim["io_enable_inv"] = kwargs.get("io_enable_inv", None)
-        dim["clock_pin"] = kwargs.get("clock_pin", None)
-        dim["inv_clock_pin"] = kwargs.get("inv_clock_pin", None)
-        dim["inv_reset_pin"] = kwargs.get("inv_reset_pin", None)
-        dim["inv_set_pin"] = kwargs.get("inv_set_pin", None)
-        dim["j_input_pin"] = kwargs.get("j_input_pin", None)
-        dim["inv_k_input_pin"] = kwargs.get("inv_k_input_pin", None)
-        dim["k_input_pin"] = kwargs.get("k_input_pin", None)
-        
-        dim["count_enable_pin"] = kwargs.get("count_enable_pin", None)
-        dim["inv_load_enable_pin"] = kwargs.get("inv_load_enable_pin", None)
-        dim["inv_up_down_input_pin"] = kwargs.get("inv_up_down_input_pin", None)
-        dim["terminal_count_pin"] = kwargs.get("terminal_count_pin", None)
-        dim["pwr"] = kwargs.get("pwr", None)
+        # Read-only view of the chip options over their defaults, no merged copy per chip
+        dim = ChainMap(kwargs, DIP_CHIP_DEFAULTS)
 
         logic_function_name = kwargs.get("logicFunctionName", None)
 
@@ -2050,105 +2129,113 @@ class ComponentSketcher:
         tags = kwargs.get("tags", [])
         chip_type = kwargs.get("type", "chip")
         io = kwargs.get("io", [])
-        symb_script = kwargs.get("symbScript", None)
-        pwr = kwargs.get("pwr", [])
         dim_line = (dim["pinCount"] - 0.30) * inter_space / 2
         dim_column = dim["chipWidth"] * inter_space
 
         params = {}
         if chip_id:
-            if self.current_dict_circuit.get(chip_id):
-                params = self.current_dict_circuit[chip_id]
+            params = self.current_dict_circuit.get(chip_id, params)
+            if params:
                 tags = params["tags"]
         else:
-            if chip_type not in self.id_type:
-                self.id_type[chip_type] = 0
-            if "chip" not in self.id_type:
-                self.id_type["chip"] = 0
-            self.id_type[chip_type] += 1
-            chip_id = "_chip_" + str(self.id_type["chip"])
+            self.id_type[chip_type] = self.id_type.get(chip_type, 0) + 1
+            num_id = self.id_type.get("chip", 0)
+            self.id_type["chip"] = num_id + 1
+            chip_id = f"_chip_{num_id}"
             self.current_dict_circuit["last_id"] = chip_id
-            self.id_type["chip"] += 1
             _, (col, line) = self.find_nearest_grid_point(x_distance, y_distance)
             self.change_hole_state(col, line, dim["pinCount"], USED)
 
         if not tags:
-            params["id"] = chip_id
-            params["XY"] = (x_distance, y_distance)
-            params["pinUL_XY"] = (x_distance + 2 * scale, y_distance - space * scale)
-            params["chipWidth"] = dim["chipWidth"]
-            params["pinCount"] = dim["pinCount"]
-            dim_line = (dim["pinCount"] - 0.30) * inter_space / 2
-            dim_column = dim["chipWidth"] * inter_space
-            label = dim["label"] + "-" + str(self.id_type[chip_type])
-            params["label"] = label
-            params["type"] = chip_type
-            params["btnMenu"] = [1, 1, 0]
-            params["symbScript"] = logic_function_name
-            params["io"] = io
-            params["pwr"] = pwr
-            params["logicFunctionName"] = logic_function_name
-            params["pwr"] = dim["pwr"]
-            params["io_select"] = dim["io_select"] 
-            params["io_out_inv"] = dim["io_out_inv"] 
-            params["io_enable"] = dim["io_enable"] 
-            params["io_enable_inv"] = dim["io_enable_inv"]
-            params["clock_pin"] = dim["clock_pin"]
-            params["inv_reset_pin"] = dim["inv_reset_pin"]
-            params["inv_set_pin"] = dim["inv_set_pin"]
-            
-            params["inv_clock_pin"] = dim["inv_clock_pin"]
-            params["j_input_pin"] = dim["j_input_pin"]
-            params["inv_k_input_pin"] = dim["inv_k_input_pin"]
-            params["k_input_pin"] = dim["k_input_pin"]
- 
-            params["count_enable_pin"] = dim["count_enable_pin"]
-            params["inv_load_enable_pin"] = dim["inv_load_enable_pin"]
-            params["inv_up_down_input_pin"] = dim["inv_up_down_input_pin"]
-            params["terminal_count_pin"] = dim["terminal_count_pin"]
-
-            num_pins_per_side = dim["pinCount"] // 2
-            tag_base = "base" + chip_id
-            tag_menu = "menu" + chip_id
-            tag_cover = "chipCover" + chip_id
-            tag_mouse = "activeArea" + chip_id
-
-            params["tags"] = [tag_base, tag_mouse]
-
-            for i in range(dim["pinCount"]):
-                self.canvas.create_rectangle(
-                    x_distance + 2 * scale + (i % num_pins_per_side) * inter_space,
-                    y_distance - (0 - (i // num_pins_per_side) * (dim_column + 0)),
-                    x_distance + 11 * scale + (i % num_pins_per_side) * inter_space,
-                    y_distance - (3 * scale - (i // num_pins_per_side) * (dim_column + 6 * scale)),
+            label = f"{dim['label']}-{self.id_type[chip_type]}"
+            tag_base = f"base{chip_id}"
+            tag_menu = f"menu{chip_id}"
+            tag_cover = f"chipCover{chip_id}"
+            tag_mouse = f"activeArea{chip_id}"
+            # All chip items also carry the chip id so the whole chip moves with a single canvas call
+            base_tags = (chip_id, tag_base)
+            cover_tags = (chip_id, tag_cover)
+
+            # Built as one literal, in the same key order for every chip
+            params = {
+                "id": chip_id,
+                "XY": (x_distance, y_distance),
+                "pinUL_XY": (x_distance + 2 * scale, y_distance - space),
+                "chipWidth": dim["chipWidth"],
+                "pinCount": dim["pinCount"],
+                "label": label,
+                "type": chip_type,
+                "btnMenu": [1, 1, 0],
+                "symbScript": logic_function_name,
+                "io": io,
+                "pwr": dim["pwr"],
+                "logicFunctionName": logic_function_name,
+                "io_select": dim["io_select"],
+                "io_out_inv": dim["io_out_inv"],
+                "io_enable": dim["io_enable"],
+                "io_enable_inv": dim["io_enable_inv"],
+                "clock_pin": dim["clock_pin"],
+                "inv_reset_pin": dim["inv_reset_pin"],
+                "inv_set_pin": dim["inv_set_pin"],
+                "inv_clock_pin": dim["inv_clock_pin"],
+                "j_input_pin": dim["j_input_pin"],
+                "inv_k_input_pin": dim["inv_k_input_pin"],
+                "k_input_pin": dim["k_input_pin"],
+                "count_enable_pin": dim["count_enable_pin"],
+                "inv_load_enable_pin": dim["inv_load_enable_pin"],
+                "inv_up_down_input_pin": dim["inv_up_down_input_pin"],
+                "terminal_count_pin": dim["terminal_count_pin"],
+                "tags": [tag_base, tag_mouse],
+            }
+
+            create_rectangle = self.canvas.create_rectangle
+            create_polygon = self.canvas.create_polygon
+            for (rx1, ry1, rx2, ry2), (px1, py1, px2, py2, px3, py3, px4, py4) in chip_pin_shapes(
+                dim["pinCount"], dim["chipWidth"], scale
+            ):
+                create_rectangle(
+                    x_distance + rx1,
+                    y_distance + ry1,
+                    x_distance + rx2,
+                    y_distance + ry2,
                     fill="#909090",
                     outline="#000000",
-                    tags=tag_base,
+                    tags=base_tags,
                 )
-                self.canvas.create_polygon(
-                    x_distance + 2 * scale + (i % num_pins_per_side) * inter_space,
-                    y_distance - space // 3 - (0 - (i // num_pins_per_side) * (dim_column + 2 * space // 3)),
-                    x_distance + space // 3 + 2 * scale + (i % num_pins_per_side) * inter_space,
-                    y_distance - (2 * space) // 3 - (0 - (i // num_pins_per_side) * (dim_column + (4 * space) // 3)),
-                    x_distance + (2 * space) // 3 + 2 * scale + (i % num_pins_per_side) * inter_space,
-                    y_distance - (2 * space) // 3 - (0 - (i // num_pins_per_side) * (dim_column + (4 * space) // 3)),
-                    x_distance + (11 + (i % num_pins_per_side) * 15) * scale,
-                    y_distance - space // 3 - (0 - (i // num_pins_per_side) * (dim_column + 2 * space // 3)),
+                create_polygon(
+                    x_distance + px1,
+                    y_distance + py1,
+                    x_distance + px2,
+                    y_distance + py2,
+                    x_distance + px3,
+                    y_distance + py3,
+                    x_distance + px4,
+                    y_distance + py4,
                     fill="#b0b0b0",
                     outline="#000000",
                     smooth=False,
-                    tags=tag_base,
+                    tags=base_tags,
                 )
 
-            params["pinUL_XY"] = (x_distance + 2 * scale, y_distance - space)
+            # Offsets shared by several of the shapes below, computed once
+            pad = 2 * scale
+            cover_top = y_distance + space // 3
+            cover_bottom = y_distance + dim_column - space // 3
+            inner_rect = (
+                x_distance + pad,
+                y_distance + pad,
+                x_distance - pad + dim_line,
+                y_distance - pad + dim_column,
+            )
+
             self.canvas.create_rectangle(
-                x_distance + 2 * scale,
+                x_distance + pad,
                 y_distance - space,
                 x_distance + 3 * scale,
                 y_distance - space + 1,
                 fill="#0000ff",
                 outline="#0000ff",
-                tags=tag_base,
+                tags=base_tags,
             )
 
             self.rounded_rect(
@@ -2160,21 +2247,18 @@ class ComponentSketcher:
                 outline="#343434",
                 fill="#343434",
                 thickness=thickness,
-                tags=tag_base,
+                tags=base_tags,
             )
 
             self.canvas.create_rectangle(
-                x_distance + 2 * scale,
-                y_distance + 2 * scale,
-                x_distance - 2 * scale + dim_line,
-                y_distance - 2 * scale + dim_column,
+                *inner_rect,
                 fill="#000000",
                 outline="#000000",
-                tags=tag_base,
+                tags=base_tags,
             )
             # FIXME false so it is never called, rework is for the future
             if False and "internalFunc" in dim and dim["internalFunc"] is not None:
-                dim["internalFunc"](x_distance, y_distance, scale=scale, tags=tag_base, **kwargs)
+                dim["internalFunc"](x_distance, y_distance, scale=scale, tags=base_tags, **kwargs)
 
             self.rounded_rect(
                 x_distance,
@@ -2185,34 +2269,34 @@ class ComponentSketcher:
                 outline="#343434",
                 fill="#343434",
                 thickness=thickness,
-                tags=tag_cover,
+                tags=cover_tags,
             )
             self.canvas.create_line(
                 x_distance,
-                y_distance + 1 * space // 3,
+                cover_top,
                 x_distance + dim_line,
-                y_distance + 1 * space // 3,
+                cover_top,
                 fill="#b0b0b0",
                 width=thickness,
-                tags=tag_cover,
+                tags=cover_tags,
             )
             self.canvas.create_line(
                 x_distance,
-                y_distance + dim_column - 1 * space // 3,
+                cover_bottom,
                 x_distance + dim_line,
-                y_distance + dim_column - 1 * space // 3,
+                cover_bottom,
                 fill="#b0b0b0",
                 width=thickness,
-                tags=tag_cover,
+                tags=cover_tags,
             )
             self.canvas.create_oval(
                 x_distance + 4 * scale,
-                y_distance + dim_column - 1 * space // 3 - 6 * scale,
+                cover_bottom - 6 * scale,
                 x_distance + 8 * scale,
-                y_distance + dim_column - 1 * space // 3 - 2 * scale,
+                cover_bottom - pad,
                 fill="#ffffff",
                 outline="#ffffff",
-                tags=tag_cover,
+                tags=cover_tags,
             )
             self.canvas.create_arc(
                 x_distance - 5 * scale,
@@ -2224,7 +2308,7 @@ class ComponentSketcher:
                 fill="#000000",
                 outline="#505050",
                 style=tk.PIESLICE,
-                tags=tag_cover,
+                tags=cover_tags,
             )
             self.draw_char(
                 x_distance + dim_line // 2,
@@ -2234,40 +2318,39 @@ class ComponentSketcher:
                 text=label,
                 color="#ffffff",
                 anchor="center",
-                tags=tag_cover,
+                tags=cover_tags,
             )
             self.canvas.create_rectangle(
-                x_distance + 2 * scale,
-                y_distance + 2 * scale,
-                x_distance - 2 * scale + dim_line,
-                y_distance - 2 * scale + dim_column,
+                *inner_rect,
                 fill="",
                 outline="",
-                tags=tag_mouse,
+                tags=(chip_id, tag_mouse, "componentActiveArea"),
             )
             self.canvas.tag_raise(tag_cover)
             self.canvas.tag_raise(tag_mouse)
-            self.canvas.addtag_withtag("componentActiveArea", tag_mouse)
             if cover_open:
-                self.canvas.itemconfig(tag_cover, state="hidden")
+                self.set_state(tag_cover, "hidden")
             else:
                 params["tags"].append(tag_cover)
             self.current_dict_circuit[chip_id] = params
-            self.draw_menu(
-                x_distance + dim_line + 2.3 * scale + space * 0, y_distance - space, thickness, label, tag_menu, chip_id
-            )
             # Only bind a tag to the menu if it has an internal function
             # FIXME (maybe?)
             # FIXME: false so it is never bound, rework is for the future
             if (
                 False
-                and "internalFunc" in dim
-                and dim["internalFunc"] is not None
-                and "logicFunction" in kwargs
-                and kwargs["logicFunction"] is not None
+                and dim.get("internalFunc") is not None
+                and kwargs.get("logicFunction") is not None
             ):
+
+                def draw_chip_menu():
+                    # The chip may have been moved since it was drawn, start from its current position
+                    x, y = self.current_dict_circuit[chip_id]["XY"]
+                    self.draw_menu(x + dim_line + 2.3 * scale, y - space, thickness, label, tag_menu, chip_id)
+
                 self.canvas.tag_bind(
-                    tag_mouse, "<Button-3>", lambda event: self.on_menu(event, tag_menu, "componentMenu", tag_mouse)
+                    tag_mouse,
+                    "<Button-3>",
+                    lambda event: self.on_menu(event, tag_menu, "componentMenu", tag_mouse, draw_menu=draw_chip_menu),
                 )
             # Bind left-click to initiate drag
             self.canvas.tag_bind(
@@ -2283,8 +2366,7 @@ class ComponentSketcher:
             d_y = y_distance - y
             params["XY"] = (x_distance, y_distance)
             params["pinUL_XY"] = (x_distance + 2 * scale, y_distance - space * scale)
-            for tg in tags:
-                self.canvas.move(tg, d_x, d_y)
+            self.canvas.move(chip_id, d_x, d_y)
 
         return x_distance + dim_line + 2.3 * scale, y_distance
 
@@ -2307,13 +2389,18 @@ class ComponentSketcher:
         """
         Get the x and y coordinates of the given column and line.
         """
-        matrix = self.matrix
-
-        element_id = str(column) + "," + str(line)
-        x, y = matrix[element_id]["xy"]
-
+        x, y = self.xy_table[(column, line)]
         return x * scale, y * scale
 
+    @staticmethod
+    def wire_points(points, offset_x, offset_y):
+        """
+        Offset a flat [x0, y0, x1, y1, ...] list of wire points, x values by offset_x and y values by offset_y.
+        """
+        points[0::2] = [x + offset_x for x in points[0::2]]
+        points[1::2] = [y + offset_y for y in points[1::2]]
+        return points
+
     def draw_wire(self, x_distance, y_distance, scale=1, width=-1, direction=HORIZONTAL, **kwargs):
         """
         Draw a wire at the given coordinates. Also handles putting it in the dict, among other stuff.
@@ -2332,8 +2419,8 @@ class ComponentSketcher:
 
         params = {}
         if wire_id:  # If the wire already exists, delete it and redraw
-            if self.current_dict_circuit.get(wire_id):
-                params = self.current_dict_circuit[wire_id]
+            params = self.current_dict_circuit.get(wire_id, params)
+            if params:
                 params["mode"] = mode
                 params["coord"] = coord
                 params["multipoints"] = multipoints
@@ -2351,18 +2438,15 @@ class ComponentSketcher:
                 dx2, dy2 = x_end - x2_old, y_end - y2_old
                 params["XY"] = (x_start, y_start, x_end, y_end)
                 params["color"] = color
-                encre = f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
-                contour = f"#{color[0]//2:02x}{color[1]//2:02x}{color[2]//2:02x}"
                 wire_body_tag = f"{wire_id}_body"
                 wire_body_shadow_tag = f"{wire_id}_body_shadow"
                 start_endpoint_tag = f"{wire_id}_start"
                 end_endpoint_tag = f"{wire_id}_end"
                 select_start_tag = f"{wire_id}_select_start"
                 select_end_tag = f"{wire_id}_select_end"
-                multipoints = [x_start, y_start] + multipoints + [x_end, y_end]
-                multipoints = [
-                    val + 5 * scale + (x_distance if i % 2 == 0 else y_distance) for i, val in enumerate(multipoints)
-                ]
+                multipoints = self.wire_points(
+                    [x_start, y_start, *multipoints, x_end, y_end], x_distance + 5 * scale, y_distance + 5 * scale
+                )
                 self.canvas.coords(wire_body_tag, multipoints)
                 self.canvas.coords(wire_body_shadow_tag, multipoints)
                 self.canvas.move(start_endpoint_tag, dx1, dy1)
@@ -2370,11 +2454,10 @@ class ComponentSketcher:
                 self.canvas.move(select_start_tag, dx1, dy1)
                 self.canvas.move(select_end_tag, dx2, dy2)
         else:
-            if "wire" not in self.id_type:
-                self.id_type["wire"] = 0
-            wire_id = "_wire_" + str(self.id_type["wire"])
+            num_id = self.id_type.get("wire", 0)
+            self.id_type["wire"] = num_id + 1
+            wire_id = f"_wire_{num_id}"
             self.current_dict_circuit["last_id"] = wire_id
-            self.id_type["wire"] += 1
             params["id"] = wire_id
             params["mode"] = mode
             params["coord"] = coord
@@ -2392,8 +2475,8 @@ class ComponentSketcher:
 
             params["XY"] = (x_start, y_start, x_end, y_end)
             params["color"] = color
-            encre = f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
-            contour = f"#{color[0]//2:02x}{color[1]//2:02x}{color[2]//2:02x}"
+            encre = rgb_hex(color[0], color[1], color[2])
+            contour = rgb_hex(color[0] // 2, color[1] // 2, color[2] // 2)
 
             # Define unique tags for the wire components
             wire_body_tag = f"{wire_id}_body"
@@ -2443,10 +2526,9 @@ class ComponentSketcher:
                 tags=(wire_id, select_end_tag),
             )
 
-            multipoints = [x_start, y_start] + multipoints + [x_end, y_end]
-            multipoints = [
-                val + 5 * scale + (x_distance if i % 2 == 0 else y_distance) for i, val in enumerate(multipoints)
-            ]
+            multipoints = self.wire_points(
+                [x_start, y_start, *multipoints, x_end, y_end], x_distance + 5 * scale, y_distance + 5 * scale
+            )
             self.canvas.create_line(
                 multipoints, fill=contour, width=8 * thickness, tags=(wire_id, wire_body_shadow_tag)
             )
@@ -2524,6 +2606,17 @@ class ComponentSketcher:
 
         return x_distance, y_distance
 
+    def draw_wires(self, x_distance, y_distance, scale=1, width=-1, direction=HORIZONTAL, **kwargs):
+        """
+        Draw several wires in a single model step.
+        "wires" holds the params of each wire; the other kwargs (e.g. matrix) are shared by all of them.
+        """
+        wires = kwargs.pop("wires", ())
+        draw_wire = self.draw_wire
+        for wire in wires:
+            draw_wire(x_distance, y_distance, scale, width, direction, **ChainMap(wire, kwargs))
+        return x_distance, y_distance
+
     def draw_pin_io(self, x_distance, y_distance, scale=1, width=-1, direction=HORIZONTAL, **kwargs):
         """
         Draw an input/output pin at the given coordinates. Also handles putting it in the dict, among other stuff.
@@ -2537,8 +2630,8 @@ class ComponentSketcher:
         color = kwargs.get("color", "#479dff")
         thickness = 1 * scale
 
-        if element_id and self.current_dict_circuit.get(element_id):
-            params = self.current_dict_circuit[element_id]
+        params = self.current_dict_circuit.get(element_id) if element_id else None
+        if params:
             old_x, old_y = params["XY"]
             params["coord"] = coord
             x_origin, y_origin = coord[0]
@@ -2551,10 +2644,9 @@ class ComponentSketcher:
             params["color"] = color
 
         else:
-            if "io" not in self.id_type:
-                self.id_type["io"] = 0
-            element_id = "_io_" + str(self.id_type["io"])
-            self.id_type["io"] += 1
+            num_id = self.id_type.get("io", 0)
+            self.id_type["io"] = num_id + 1
+            element_id = f"_io_{num_id}"
             params = {}
             params["id"] = element_id
             params["tags"] = []
@@ -2729,6 +2821,7 @@ class ComponentSketcher:
                 params["tags"].append(line3_id)
 
             self.current_dict_circuit[element_id] = params
+            self.pin_ios_by_type.setdefault(element_type, {})[element_id] = params
 
             print("coord : " + str(coord[0][0]) + "," + str(coord[0][1]))
 
@@ -2758,47 +2851,22 @@ class ComponentSketcher:
         for key in self.id_type:
             self.id_type[key] = 0
         self.current_dict_circuit.clear()
+        for pin_ios in self.pin_ios_by_type.values():
+            pin_ios.clear()
+        self.item_state.clear()
+        self.open_menu = None
         # TODO Khalid update the Circuit instance
 
-    def draw_battery(
-        self,
-        x_distance,
-        y_distance,
-        scale=1,
-        width=-1,
-        direction="HORIZONTAL",
-        pos_wire_end=None,
-        neg_wire_end=None,
-        **kwargs,
-    ):
+    def load_battery_image(self, scale):
         """
-        Draws a battery image at the given coordinates with two hanging wires on the left side.
-
-        Parameters:
-        - x_distance (int): The x-coordinate where the battery will be drawn.
-        - y_distance (int): The y-coordinate where the battery will be drawn.
-        - scale (float): Scaling factor for the battery size.
-        - width (int): Specific width if needed, otherwise calculated from scale.
-        - direction (str): Orientation of the battery, currently only 'HORIZONTAL' is handled.
-        - pos_wire_end (tuple): Coordinates where the positive wire should end.
-        - neg_wire_end (tuple): Coordinates where the negative wire should end.
-        - kwargs: Additional keyword arguments.
-
-        Returns:
-        - Tuple of (x_distance, y_distance)
+        Loads the battery image from disk and resizes it for the given scale.
+        Returns None if the image cannot be loaded.
         """
-        battery_id = "_battery"
-
-        # Check if battery already exists
-        if battery_id in self.current_dict_circuit:
-            print("Battery already exists in the circuit.")
-            return x_distance, y_distance
-
         image_path = Path(resource_path("Assets/Icons/battery.png")).resolve()
 
         if not os.path.isfile(image_path):
             print(f"Battery image not found at {image_path}.")
-            return x_distance, y_distance
+            return None
 
         try:
             battery_photo = tk.PhotoImage(file=image_path)
@@ -2826,20 +2894,55 @@ class ComponentSketcher:
                 subsample_y = int(1 / scale_y)
                 battery_photo = battery_photo.subsample(1, subsample_y)
 
-            new_width = battery_photo.width()
-            new_height = battery_photo.height()
-
         except Exception as e:
             print(f"Error loading battery image: {e}")
+            return None
+
+        return battery_photo
+
+    def draw_battery(
+        self,
+        x_distance,
+        y_distance,
+        scale=1,
+        width=-1,
+        direction="HORIZONTAL",
+        pos_wire_end=None,
+        neg_wire_end=None,
+        **kwargs,
+    ):
+        """
+        Draws a battery image at the given coordinates with two hanging wires on the left side.
+
+        Parameters:
+        - x_distance (int): The x-coordinate where the battery will be drawn.
+        - y_distance (int): The y-coordinate where the battery will be drawn.
+        - scale (float): Scaling factor for the battery size.
+        - width (int): Specific width if needed, otherwise calculated from scale.
+        - direction (str): Orientation of the battery, currently only 'HORIZONTAL' is handled.
+        - pos_wire_end (tuple): Coordinates where the positive wire should end.
+        - neg_wire_end (tuple): Coordinates where the negative wire should end.
+        - kwargs: Additional keyword arguments.
+
+        Returns:
+        - Tuple of (x_distance, y_distance)
+        """
+        battery_id = "_battery"
+
+        # Check if battery already exists
+        if battery_id in self.current_dict_circuit:
+            print("Battery already exists in the circuit.")
             return x_distance, y_distance
 
-        battery_obj = self.canvas.create_image(
-            x_distance - 10, y_distance, anchor="nw", image=battery_photo, tags=(battery_id,)
-        )
+        battery_photo = self.battery_images.get(scale)
+        if battery_photo is None:
+            battery_photo = self.load_battery_image(scale)
+            if battery_photo is None:
+                return x_distance, y_distance
+            self.battery_images[scale] = battery_photo
+        new_height = battery_photo.height()
 
-        if not hasattr(self, "image_references"):
-            self.image_references = []
-        self.image_references.append(battery_photo)
+        self.canvas.create_image(x_distance - 10, y_distance, anchor="nw", image=battery_photo, tags=(battery_id,))
 
         neg_wire_offset_x = 0  # Left edge
         neg_wire_offset_y = new_height * 0.2  # 20% from the top
@@ -2903,8 +3006,8 @@ class ComponentSketcher:
         """
 
         thickness = 1 * self.scale_factor
-        encre = f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
-        contour = f"#{max(color[0] - 100, 0):02x}{max(color[1] - 100, 0):02x}{max(color[2] - 100, 0):02x}"
+        encre = rgb_hex(color[0], color[1], color[2])
+        contour = rgb_hex(max(color[0] - 100, 0), max(color[1] - 100, 0), max(color[2] - 100, 0))
 
         wire_body_tag = f"{wire_id}_body"
         wire_body_shadow_tag = f"{wire_id}_body_shadow"
@@ -2995,7 +3098,6 @@ class ComponentSketcher:
         """
         Handler for when a battery wire endpoint is clicked.
         """
-        allowed_positions = self.get_power_line_last_pins()
         x, y = event.x, event.y
         _, nearest_point_coord = self.find_nearest_grid_point(x, y)
         old_col, old_line = nearest_point_coord
@@ -9,10 +9,17 @@ from dataclasses import dataclass
 import os
 import tkinter as tk
 import json
+import logging
 import subprocess
 import platform
+import queue
+import sys
+import threading
 import serial.tools.list_ports  # type: ignore
 import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import NamedTuple, cast
 
 from breadboard import Breadboard
 from component_sketch import ComponentSketcher
@@ -38,43 +45,229 @@ if (os.name in ("posix", "darwin")) and "linux" not in platform.platform().lower
 else:
     from tkinter import Button, messagebox, filedialog, ttk
 
-MICROCONTROLLER_PINS = {
-    "Arduino Mega": {
-        "input_pins": [22, 23, 24, 25, 26, 27, 28, 29],
-        "output_pins": [32, 33, 34, 35, 36, 37],
-        "clock_pin": 2,
-    },
-    "Arduino Uno": {
-        "input_pins": [2, 3, 4, 5, 6, 7, 8, 9],
-        "output_pins": [10, 11, 12, 13],
-        "clock_pin": 2,
-    },
-    "Arduino Micro": {
-        "input_pins": [2, 3, 4, 5, 6, 7, 8, 9],
-        "output_pins": [10, 11, 12, 13],
-        "clock_pin": 2,
-    },
-    "Arduino Mini": {
-        "input_pins": [2, 3, 4, 5, 6, 7, 8, 9],
-        "output_pins": [10, 11, 12, 13],
-        "clock_pin": 2,
-    },
-    "STM32": {
-        "input_pins": ["PA0", "PA1", "PA2", "PA3", "PB0", "PB1", "PB2", "PB3"],
-        "output_pins": ["PC0", "PC1", "PC2", "PC3", "PC4", "PC5"],
-        "clock_pin": "PA0",
-    },
-    "NodeMCU ESP8266": {
-        "input_pins": ["D1", "D2", "D3", "D4", "D5", "D6", "D7", "D8"],
-        "output_pins": ["D0", "D1", "D2", "D3", "D4", "D5"],
-        "clock_pin": "D2",
-    },
-    "NodeMCU ESP32": {
-        "input_pins": [32, 33, 34, 35, 25, 26, 27, 14],
-        "output_pins": [23, 22, 21, 19, 18, 5],
-        "clock_pin": 2,
-    },
+logger = logging.getLogger(__name__)
+"""Logger of the menu handlers, silent below WARNING unless the application configures logging."""
+
+if sys.platform == "win32":
+    import winreg  # pylint: disable=import-error
+
+DOCUMENTATION_PATH = Path(__file__).parent / "Assets" / "ArduinoLogique_Document_utilisateur.pdf"
+"""The user guide opened by the 'Documentation' menu item."""
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+class MCUPins(NamedTuple):
+    """Input, output and clock pins of a microcontroller."""
+
+    input_pins: tuple
+    """Pins wired to the circuit inputs, in order."""
+    output_pins: tuple
+    """Pins wired to the circuit outputs, in order."""
+    clock_pin: int | str
+    """Pin wired to the circuit clock."""
+
+
+MICROCONTROLLER_PINS = MappingProxyType({
+    "Arduino Mega": MCUPins(
+        input_pins=(22, 23, 24, 25, 26, 27, 28, 29),
+        output_pins=(32, 33, 34, 35, 36, 37),
+        clock_pin=2,
+    ),
+    "Arduino Uno": MCUPins(
+        input_pins=(2, 3, 4, 5, 6, 7, 8, 9),
+        output_pins=(10, 11, 12, 13),
+        clock_pin=2,
+    ),
+    "Arduino Micro": MCUPins(
+        input_pins=(2, 3, 4, 5, 6, 7, 8, 9),
+        output_pins=(10, 11, 12, 13),
+        clock_pin=2,
+    ),
+    "Arduino Mini": MCUPins(
+        input_pins=(2, 3, 4, 5, 6, 7, 8, 9),
+        output_pins=(10, 11, 12, 13),
+        clock_pin=2,
+    ),
+    "STM32": MCUPins(
+        input_pins=("PA0", "PA1", "PA2", "PA3", "PB0", "PB1", "PB2", "PB3"),
+        output_pins=("PC0", "PC1", "PC2", "PC3", "PC4", "PC5"),
+        clock_pin="PA0",
+    ),
+    "NodeMCU ESP8266": MCUPins(
+        input_pins=("D1", "D2", "D3", "D4", "D5", "D6", "D7", "D8"),
+        output_pins=("D0", "D1", "D2", "D3", "D4", "D5"),
+        clock_pin="D2",
+    ),
+    "NodeMCU ESP32": MCUPins(
+        input_pins=(32, 33, 34, 35, 25, 26, 27, 14),
+        output_pins=(23, 22, 21, 19, 18, 5),
+        clock_pin=2,
+    ),
+})
+"""Pin assignments of each supported microcontroller, built once at import and read-only."""
+
+MCU_NAMES = tuple(MICROCONTROLLER_PINS)
+"""Names offered by select_microcontroller, in declaration order."""
+
+GATE_TEMPLATES = {
+    "NandGate": ("!( ", " & ", " ) "),
+    "AndGate": ("( ", " & ", " ) "),
+    "NorGate": ("! ( ", " | ", " ) "),
+    "OrGate": ("( ", " | ", " ) "),
+    "XorGate": ("( ", " ^ ", " ) "),
+    "XnorGate": ("! ( ", " | ", " ) "),
 }
+"""(prefix, separator, suffix) used by decodeFunc to write the expression of each multi-input gate."""
+
+INVERTED_SELECT_BITS = tuple((v >> 2 & 1 ^ 1, v >> 1 & 1 ^ 1, v & 1 ^ 1) for v in range(8))
+"""(v0, v1, v2) flags for each Mux/Demux channel: 1 when the matching select input is negated."""
+
+NEGATIONS = ("", " !")
+"""Prefix written before a select input in a Mux expression, by INVERTED_SELECT_BITS flag."""
+
+CHIP_INPUT_KEYS = (
+    ("chip_select", "sel", False),
+    ("chip_in_enable_inv", "einv", False),
+    ("chip_in_enable", "enb", False),
+    ("chip_in_inv_reset", "irst", True),
+    ("chip_in_inv_set", "iset", True),
+    ("chip_in_clock", "clk", True),
+    ("chip_in_inv_clock", "iclk", True),
+    ("chip_in_j", "J", True),
+    ("chip_in_k", "K", True),
+    ("chip_in_inv_k", "iK", True),
+    ("count_enable_pin", "CE", True),
+    ("inv_load_enable_pin", "iL", True),
+    ("inv_up_down_input_pin", "iU", True),
+)
+"""
+Chip input lists of checkCloseCircuit as (params key, decodeFunc key, pins tagged with their function number).
+An input found in several lists gets the key of the last one.
+"""
+
+CHIP_EXTRA_INPUTS = ("sel", "einv", "enb", "clk", "irst", "iset", "iclk", "K", "iK", "CE", "iL", "iU")
+"""Keys of CHIP_INPUT_KEYS whose pins are appended to the inputs of a function, in decodeFunc order."""
+
+SAVE_SKIPPED_KEYS = frozenset({"id", "tags"})
+"""Component keys rebuilt at load time, so not written by save_file."""
+
+SAVE_SKIPPED_WIRE_KEYS = SAVE_SKIPPED_KEYS | {"XY"}
+"""Keys not written for wires, whose XY is recalculated from their coordinates."""
+
+SAVE_SKIPPED_BATTERY_KEYS = SAVE_SKIPPED_KEYS | {"battery_rect"}
+"""Keys not written for the battery, whose rectangle is redrawn."""
+
+SAVE_SKIPPED_KEYS_BY_KIND = {"wire": SAVE_SKIPPED_WIRE_KEYS, "battery": SAVE_SKIPPED_BATTERY_KEYS}
+"""Keys not written by save_file, by component kind (see component_kind). Other kinds use SAVE_SKIPPED_KEYS."""
+
+PORTS_CACHE_TTL = 5.0
+"""Seconds during which a COM port enumeration is reused by configure_ports."""
+
+
+def component_kind(key: str) -> str:
+    """
+    Returns the kind of a circuit component from its key: "_chip_3" -> "chip", "_battery_pos_wire" -> "battery".
+    Keys not following the "_<kind>_..." pattern are returned unchanged.
+    """
+    return key.split("_", 2)[1] if key.startswith("_") else key
+
+
+def chip_pins(pin_list: list, chip_id: str, nf: int | None = None) -> list:
+    """
+    Returns the pins of chip_id from a checkCircuit pin list of (chip_id, pin, pin, ...) rows.
+    With nf, pins are (col, line, nfunc) and only the (col, line) of function nf are kept.
+    """
+    pins = next((row[1:] for row in pin_list if row[0] == chip_id), ())
+    if nf is None:
+        return list(pins)
+    return [(c1, l1) for (c1, l1, nfunc) in pins if nfunc == nf]
+
+
+def not_expression(inVar: list[dict]) -> str:
+    """Returns the script expression of a NotGate from its decoded input."""
+    return f"! {inVar[0]['val']} "
+
+
+def mux_expression(inVar: list[dict]) -> str:
+    """Returns the script expression of an 8-to-1 Mux: 8 data inputs, 3 selects and an inverted enable."""
+    e = []
+    for v in range(8):
+        v0, v1, v2 = INVERTED_SELECT_BITS[v]
+        e.append(
+            f"( {inVar[v]['val']} & {inVar[11]['einv']} & {NEGATIONS[v0]}{inVar[8]['sel']} & "
+            f"{NEGATIONS[v1]}{inVar[9]['sel']} & {NEGATIONS[v2]}{inVar[10]['sel']} ) "
+        )
+    return " ( " + "| ".join(e) + " ) "
+
+
+def demux_expression(inVar: list[dict]) -> str:
+    """Returns the script expression of the Demux output numO, selected by the 3 inputs and the 3 enables."""
+    v0, v1, v2 = INVERTED_SELECT_BITS[inVar[0]['numO']]
+    return (
+        f"({v0 * ' !'}{inVar[0]['val']} & {v1 * '!'}{inVar[1]['val']} & {v2 * '!'}{inVar[2]['val']} & "
+        f"{inVar[3]['einv']} & {inVar[4]['einv']} & {inVar[5]['enb']} ) "
+    )
+
+
+def dflipflop_expression(inVar: list[dict]) -> str:
+    """Returns the script expression of a DFlipFlop output."""
+    return f"({inVar[0]['val']} & CLK & {inVar[3]['iset']} & {inVar[2]['irst']} | !{inVar[3]['iset']} ) "
+
+
+EXPRESSION_BUILDERS = {
+    "NotGate": not_expression,
+    "Mux": mux_expression,
+    "Demux": demux_expression,
+    "DFlipFlop": dflipflop_expression,
+}
+"""Builders used by decodeFunc for the functions whose expression depends only on their decoded inputs."""
+
+
+def read_circuit_file(file_path: str) -> dict:
+    """
+    Reads a saved circuit in a single binary read, parsed with orjson when it is installed.
+    json.loads takes the bytes directly and detects their UTF encoding, so no text decoding layer is needed.
+    """
+    with open(file_path, "rb") as file:
+        data = file.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_circuit_file(file_path: str, circuit_data: dict) -> None:
+    """
+    Writes a circuit in a single write, with orjson (2-space indent) when it is installed.
+    The stdlib fallback writes compact JSON: the pretty-printing encoder is much slower.
+    """
+    if orjson is not None:
+        with open(file_path, "wb") as file:
+            file.write(orjson.dumps(circuit_data, option=orjson.OPT_INDENT_2))
+        return
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(json.dumps(circuit_data, separators=(",", ":")))
+
+
+def fast_list_com_ports() -> list[str]:
+    """
+    Lists the available COM port devices.
+    On Windows, the ports are read from the SERIALCOMM registry key in a single call, instead of pyserial's
+    SetupDi enumeration which queries every device (seconds per Bluetooth port).
+    Falls back to pyserial on other platforms or if the registry cannot be read.
+    """
+    if sys.platform == "win32":
+        try:
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"HARDWARE\DEVICEMAP\SERIALCOMM") as key:
+                return [winreg.EnumValue(key, i)[1] for i in range(winreg.QueryInfoKey(key)[1])]
+        except FileNotFoundError:
+            return []  # The key only exists while at least one serial port is present
+        except OSError as e:
+            logger.warning("Error reading COM ports from the registry: %s", e)
+    return [comport.device for comport in serial.tools.list_ports.comports()]
 
 
 @dataclass
@@ -86,9 +279,11 @@ class SerialPort:
     baud_rate: int
     """The baud rate for the port."""
     timeout: int
-    """The timeout for the port."""
+    """The read timeout for the port, in seconds. send_data waits up to this long for the board's reply."""
     connection: serial.Serial | None
     """The serial connection object."""
+    write_timeout: float = 5
+    """The write timeout for the port, in seconds, so a stuck USB endpoint raises instead of freezing the UI."""
 
     def connect(self):
         """Open the serial connection."""
@@ -98,10 +293,21 @@ class SerialPort:
                                             parity=serial.PARITY_NONE, 
                                             stopbits=serial.STOPBITS_ONE,
                                             bytesize=serial.EIGHTBITS,
-                                            timeout=self.timeout)
-            print(f"Serial port {self.com_port} opened successfully.")
+                                            timeout=self.timeout,
+                                            write_timeout=self.write_timeout)
+            logger.info("Serial port %s opened successfully.", self.com_port)
         except serial.SerialException as e:
-            print(f"Error opening port {self.com_port}: {e}")
+            logger.error("Error opening port %s: %s", self.com_port, e)
+
+    def ensure_open(self):
+        """
+        Open the serial connection unless it is already open.
+        Reopening an Arduino port toggles DTR and resets the board, so the connection is kept between uploads.
+        """
+        if self.connection is not None and self.connection.is_open and self.connection.port != self.com_port:
+            self.connection.close()  # Another port was selected while an upload kept the previous one open
+        if self.connection is None or not self.connection.is_open:
+            self.connect()
 
 
 class Menus:
@@ -153,9 +359,30 @@ class Menus:
         self.serial_port = SerialPort(None, 9600, 1, None)
         """The serial port configuration."""
 
+        self.serial_lock = threading.Lock()
+        """Serializes uses of the serial connection between the upload thread and the Tk thread."""
+
         self.open_file_path: str | None = None
         """The file path for the current open file."""
 
+        self.ports_cache: tuple[float, list[str]] | None = None
+        """The last COM port enumeration as (time.monotonic() timestamp, port devices)."""
+
+        self.menu_buttons: dict[str, Button] = {}
+        """The menu bar buttons, by menu name."""
+
+        self.open_dropdown: tk.Frame | None = None
+        """The dropdown currently shown, None when all dropdowns are hidden."""
+
+        self.link_index: dict[int, tuple[list, frozenset]] = {}
+        """The points covered by each zone checked by checkCloseCircuit, as id(zone) -> (zone, points)."""
+
+        self.io_in_by_point: dict[tuple[int, int], int] = {}
+        """The index in io_in of the first external input zone covering each point, rebuilt by checkCircuit."""
+
+        self.chip_in_wire_by_point: dict[tuple[int, int], int] = {}
+        """The index in chip_in_wire of the first wired input zone covering each point, rebuilt by checkCircuit."""
+
         # Define menu items and their corresponding dropdown options
         menus = {
             "Fichier": ["Nouveau", "Ouvrir", "Enregistrer", "Enregistrer sous", "Quitter"],
@@ -172,7 +399,7 @@ class Menus:
             "Ouvrir": self.open_file,
             "Enregistrer": lambda: self.save_file(False),
             "Enregistrer sous": self.save_file,
-            "Quitter": self.parent.quit,
+            "Quitter": self.shutdown,
             "Configurer le port série": self.configure_ports,
             "Table de correspondance": self.show_correspondence_table,
             "Choisir un microcontrôleur": self.select_microcontroller,
@@ -182,6 +409,11 @@ class Menus:
             "À propos": self.about,
         }
 
+        # Dropdown options share one set of class bindings instead of one command per option
+        self.parent.bind_class("DropdownOption", "<ButtonRelease-1>", self.select_menu_item)
+        self.parent.bind_class("DropdownOption", "<Enter>", lambda event: self.highlight_menu_item(event, "#444444"))
+        self.parent.bind_class("DropdownOption", "<Leave>", lambda event: self.highlight_menu_item(event, "#333333"))
+
         for menu_name, options in menus.items():
             self.create_menu(menu_name, options, menu_commands)
 
@@ -195,12 +427,15 @@ class Menus:
         )
         self.microcontroller_label.pack(side="right", fill="y", padx=175)
 
-        # Bind to parent to close dropdowns when clicking outside
+        # Bind to parent to close dropdowns when clicking outside.
+        # Every widget of the window (canvas included) carries the toplevel in its bindtags, so one binding is enough.
         self.parent.bind("<Button-1>", self.close_dropdown, add="+")
-        self.canvas.bind("<Button-1>", self.close_dropdown, add="+")
 
         self.parent.bind("<Control-s>", lambda _: self.save_file(False), add="+")
 
+        # The serial connection stays open between uploads, release it when the window is closed
+        self.parent.winfo_toplevel().protocol("WM_DELETE_WINDOW", self.shutdown)
+
     def select_microcontroller(self):
         """Handler for microcontroller selection."""
         # Create a new top-level window for the dialog
@@ -213,20 +448,16 @@ class Menus:
         # Create a label for the combobox
         label = tk.Label(dialog, text="Choisir:")
         label.pack(pady=10)
-        available_microcontrollers = list(MICROCONTROLLER_PINS.keys())
-        # Create a combobox with the options
-        combobox = ttk.Combobox(dialog, values=available_microcontrollers)
-        combobox.set(self.selected_microcontroller if self.selected_microcontroller else "Choisir un microcontrôleur")
+        # Create a combobox with the options, read-only so only a known microcontroller can be chosen
+        combobox = ttk.Combobox(dialog, values=MCU_NAMES, state="readonly")
+        combobox.set(self.selected_microcontroller or MCU_NAMES[0])  # Arduino Mega par défaut
         combobox.pack(pady=10)
-        
-        default_option = "Arduino Mega"  # Changez ceci selon votre choix
-        combobox.set(default_option)   # Définit l'option par défaut
+
         # Create a button to confirm the selection
         def confirm_selection():
             selected_option = combobox.get()
-            print(f"Selected option: {selected_option}")
+            logger.info("%s selected.", selected_option)
             self.selected_microcontroller = selected_option
-            print(f"{selected_option} selected.")
             # Update the label text
             self.microcontroller_label.config(text=self.selected_microcontroller)
             dialog.destroy()
@@ -250,61 +481,87 @@ class Menus:
     #         treeview.insert("", "end", values=(pin_number, "Output", mcu_pin))
     #         self.mcu_pin.update({f"O{pin_number}":f"O{mcu_pin}"})
             
-    def show_correspondence_table(self, show=True):
-        """Displays the correspondence table between pin_io objects and microcontroller pins in a table format."""
+    def compute_pin_mapping(self):
+        """
+        Maps the pin_io objects to the pins of the selected microcontroller and stores the result in self.mcu_pin.
+        Problems (no microcontroller, too many pins) are reported with a messagebox.
+
+        Returns:
+        - list[tuple] | None: The (pin_io number, type, microcontroller pin) rows of the correspondence table,
+          or None if the mapping is not possible.
+        """
         if self.selected_microcontroller is None:
             messagebox.showwarning(
                 "Aucun microcontrôleur sélectionné", "Veuillez d'abord sélectionner un microcontrôleur."
             )
-            return
+            return None
 
         pin_mappings = MICROCONTROLLER_PINS.get(self.selected_microcontroller)
         if not pin_mappings:
             messagebox.showerror("Erreur", f"Aucun mappage de broches trouvé pour {self.selected_microcontroller}.")
-            return
-
-        input_pins = pin_mappings["input_pins"]
-        output_pins = pin_mappings["output_pins"]
+            return None
 
-        # Gather pin_io objects from current_dict_circuit
-        pin_ios = [value for key, value in self.current_dict_circuit.items() if key.startswith("_io_")]
+        input_pins, output_pins, clock_pin = pin_mappings
 
-        # Separate pin_ios into inputs, outputs, and clocks
-        input_pin_ios = [pin for pin in pin_ios if pin["type"] == INPUT]
-        output_pin_ios = [pin for pin in pin_ios if pin["type"] == OUTPUT]
-        clock_pin_ios = [pin for pin in pin_ios if pin["type"] == CLOCK]
+        # The sketcher keeps the pin_io objects split into inputs, outputs, and clocks as they are placed
+        pin_ios_by_type = self.sketcher.pin_ios_by_type
+        input_pin_ios = list(pin_ios_by_type[INPUT].values())
+        output_pin_ios = list(pin_ios_by_type[OUTPUT].values())
+        clock_pin_ios = list(pin_ios_by_type[CLOCK].values())
 
         # Ensure only one CLOCK type
         if len(clock_pin_ios) > 1:
             messagebox.showerror("Erreur d'horloge", "Une seule HORLOGE est autorisée.")
-            return
+            return None
 
         # Check pin counts
-        if len(input_pin_ios) > len(input_pins):
+        n_in, n_out = len(input_pin_ios), len(output_pin_ios)
+        if n_in > len(input_pins):
             messagebox.showerror(
                 "Trop d'entrées",
-                f"Vous avez {len(input_pin_ios)} broches d'entrée, mais seulement "
+                f"Vous avez {n_in} broches d'entrée, mais seulement "
                 f"{len(input_pins)} broches d'entrée disponibles sur le microcontrôleur.",
             )
-            return
-        if len(output_pin_ios) > len(output_pins):
+            return None
+        if n_out > len(output_pins):
             messagebox.showerror(
                 "Trop de sorties",
-                f"Vous avez {len(output_pin_ios)} broches de sortie, mais seulement "
+                f"Vous avez {n_out} broches de sortie, mais seulement "
                 f"{len(output_pins)} broches de sortie disponibles sur le microcontrôleur.",
             )
+            return None
+
+        # Map the input and output pins
+        mcu_pin_map = self.mcu_pin = {}
+        rows = []
+        for pin_io, mcu_pin in zip(input_pin_ios, input_pins):
+            pin_number = pin_io["id"].rpartition("_")[2]
+            rows.append((pin_number, "Entrée", mcu_pin))
+            mcu_pin_map[f"I{pin_number}"] = f"I{mcu_pin}"
+
+        for pin_io, mcu_pin in zip(output_pin_ios, output_pins):
+            pin_number = pin_io["id"].rpartition("_")[2]
+            rows.append((pin_number, "Sortie", mcu_pin))
+            mcu_pin_map[f"O{pin_number}"] = f"O{mcu_pin}"
+
+        if clock_pin_ios:
+            pin_number = clock_pin_ios[0]["id"].rpartition("_")[2]
+            rows.append((pin_number, "clk input", clock_pin))
+        return rows
+
+    def show_correspondence_table(self):
+        """Displays the correspondence table between pin_io objects and microcontroller pins in a table format."""
+        rows = self.compute_pin_mapping()
+        if rows is None:
             return
 
         # Create a new window for the correspondence table
         table_window = tk.Toplevel(self.parent)
-        table_window.withdraw()
         table_window.title("Table de correspondance")
         table_window.geometry("500x350")
 
-        # if show:
         # Create a Treeview widget for the table
         tree = ttk.Treeview(table_window, columns=("ID", "Type", "MCU Pin"), show="headings", height=15)
-        tree.pack(expand=True, fill="both", padx=10, pady=10)
 
         # Define columns and headings
         tree.column("ID", anchor="center", width=120)
@@ -314,47 +571,25 @@ class Menus:
         tree.heading("Type", text="Type")
         tree.heading("MCU Pin", text="Pin du microcontrôleur")
 
-        #self.map_mcu_pin(tree, input_pin_ios, output_pin_ios, input_pins, output_pins)
-        # Populate the table with input and output pin mappings
-        self.mcu_pin= {}
-        for idx, pin_io in enumerate(input_pin_ios):
-            mcu_pin = input_pins[idx]
-            pin_number = pin_io["id"].split("_")[-1]
-            # if show:
-            tree.insert("", "end", values=(pin_number, "Entrée", mcu_pin))
-            self.mcu_pin.update({f"I{pin_number}":f"I{mcu_pin}"})
-            
+        # Insert all rows before the tree is packed, so it is laid out once instead of after every row
+        insert = tree.insert
+        for row in rows:
+            insert("", tk.END, values=row)
+        tree.pack(expand=True, fill="both", padx=10, pady=10)
+
+        # Add a scrollbar if the list gets too long
+        scrollbar = ttk.Scrollbar(table_window, orient="vertical", command=tree.yview)
+        tree.configure(yscroll=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
 
-        for idx, pin_io in enumerate(output_pin_ios):
-            mcu_pin = output_pins[idx]
-            pin_number = pin_io["id"].split("_")[-1]
-            tree.insert("", "end", values=(pin_number, "Sortie", mcu_pin))
-            self.mcu_pin.update({f"O{pin_number}":f"O{mcu_pin}"})
-
-        if show:
-            table_window.deiconify() 
-            # Add a scrollbar if the list gets too long
-            scrollbar = ttk.Scrollbar(table_window, orient="vertical", command=tree.yview)
-            tree.configure(yscroll=scrollbar.set)
-            scrollbar.pack(side="right", fill="y")
-            if clock_pin_ios:
-                clock_pin = pin_mappings["clock_pin"]
-                pin_number = clock_pin_ios[0]["id"].split("_")[-1]
-                tree.insert("", "end", values=(pin_number, "clk input", clock_pin))
-
-            # Add a scrollbar if the list gets too long
-            scrollbar = ttk.Scrollbar(table_window, orient="vertical", command=tree.yview)
-            tree.configure(yscroll=scrollbar.set)
-            scrollbar.pack(side="right", fill="y")
-
-            # Show the table in the new window
-            table_window.transient(self.parent)  # Set to be on top of the parent window
-            table_window.grab_set()  # Prevent interaction with the main window until closed
-            table_window.mainloop()
+        # Show the table in the new window
+        table_window.transient(self.parent)  # Set to be on top of the parent window
+        table_window.wait_visibility()  # On X11, a grab on a window not yet viewable fails
+        table_window.grab_set()  # Prevent interaction with the main window until closed
 
     def create_menu(self, menu_name, options, menu_commands):
         """
-        Creates a menu button with a dropdown.
+        Creates a menu button, its dropdown is built on first open.
 
         Parameters:
         - menu_name (str): The name of the top-level menu (e.g., "File").
@@ -380,6 +615,21 @@ class Menus:
         )
         btn.pack(side="left")
 
+        # The dropdown is only built the first time the menu is opened, see build_dropdown
+        btn.menu_spec = (options, menu_commands)
+        self.menu_buttons[menu_name] = btn
+
+    def build_dropdown(self, btn):
+        """
+        Creates the dropdown frame of a menu button from the options stored by create_menu.
+
+        Parameters:
+        - btn (Button): The menu button to attach the dropdown to.
+
+        Returns:
+        - tk.Frame: The new dropdown, hidden.
+        """
+        options, menu_commands = btn.menu_spec
         # Create the dropdown frame
         dropdown = tk.Frame(self.parent, bg="#333333", bd=1, relief="solid", width=250)
 
@@ -389,36 +639,54 @@ class Menus:
         dropdown.place(x=0, y=0, width=250, height=dropdown_height)  # Initial size based on options
         dropdown.place_forget()  # Hide initially
 
-        def select_menu_item(option):
-            """Wrapper function to close dropdown and execute the menu command."""
-            self.close_dropdown(None)
-            menu_commands.get(option, lambda: print(f"{option} selected"))()
-
-        # Populate the dropdown with menu options
+        # Populate the dropdown with menu options, clicks are handled by the DropdownOption class bindings
         for option in options:
-            option_btn = Button(
+            option_label = tk.Label(
                 dropdown,
                 text=option,
                 bg="#333333",
                 fg="white",
-                activebackground="#444444",
-                activeforeground="white",
-                highlightbackground="#333333",  # Border color when inactive
-                highlightcolor="#444444",  # Border color when active
                 bd=0,
                 anchor="w",
-                width=250,
                 padx=20,
                 pady=5,
                 font=("FiraCode-Bold", 12),
-                command=lambda o=option: select_menu_item(o),
-                borderwidth=0,
                 highlightthickness=0,
             )
-            option_btn.pack(fill="both")
+            option_label.bindtags(("DropdownOption", *option_label.bindtags()))
+            option_label.pack(fill="both")
+        dropdown.menu_commands = menu_commands
 
         # Attach the dropdown to the button
         btn.dropdown = dropdown
+        return dropdown
+
+    def highlight_menu_item(self, event, color):
+        """
+        Sets the background of the dropdown option under the pointer.
+
+        Parameters:
+        - event (tk.Event): The enter or leave event on a dropdown option label.
+        - color (str): The new background color.
+        """
+        option_label = cast(tk.Label, event.widget)
+        option_label.configure(bg=color)
+
+    def select_menu_item(self, event):
+        """
+        Closes the dropdown and executes the command of the clicked option.
+
+        Parameters:
+        - event (tk.Event): The release event on a dropdown option label.
+        """
+        option_label = event.widget
+        # Like a button, only trigger if the pointer is still over the option when released
+        if option_label.winfo_containing(event.x_root, event.y_root) is not option_label:
+            return
+        option = option_label.cget("text")
+        option_label.config(bg="#333333")
+        self.close_dropdown(None)
+        option_label.master.menu_commands.get(option, lambda: logger.debug("%s selected", option))()
 
     def toggle_dropdown(self, menu_name):
         """
@@ -428,20 +696,21 @@ class Menus:
         Parameters:
         - menu_name (str): The name of the menu to toggle.
         """
-        for child in self.menu_bar.winfo_children():
-            if isinstance(child, Button) and hasattr(child, "dropdown"):
-                if child["text"] == menu_name:
-                    if child.dropdown.winfo_ismapped():
-                        child.dropdown.place_forget()
-                    else:
-                        # Position the dropdown below the button
-                        btn_x = child.winfo_rootx() - self.parent.winfo_rootx()
-                        btn_y = child.winfo_rooty() - self.parent.winfo_rooty() + child.winfo_height()
-                        child.dropdown.place(x=btn_x, y=btn_y, width=250)
-                        print(f"Opened dropdown for {menu_name}")
-                        child.dropdown.lift()  # Ensure dropdown is on top
-                else:
-                    child.dropdown.place_forget()
+        btn = self.menu_buttons[menu_name]
+        dropdown = getattr(btn, "dropdown", None) or self.build_dropdown(btn)
+        if dropdown is self.open_dropdown:
+            dropdown.place_forget()
+            self.open_dropdown = None
+            return
+        if self.open_dropdown is not None:
+            self.open_dropdown.place_forget()
+        # Position the dropdown below the button
+        btn_x = btn.winfo_rootx() - self.parent.winfo_rootx()
+        btn_y = btn.winfo_rooty() - self.parent.winfo_rooty() + btn.winfo_height()
+        dropdown.place(x=btn_x, y=btn_y, width=250)
+        logger.debug("Opened dropdown for %s", menu_name)
+        dropdown.lift()  # Ensure dropdown is on top
+        self.open_dropdown = dropdown
 
     def is_descendant(self, widget, parent):
         """
@@ -454,11 +723,9 @@ class Menus:
         Returns:
         - bool: True if widget is a descendant of parent, else False.
         """
-        while widget:
-            if widget == parent:
-                return True
-            widget = widget.master
-        return False
+        # Tk path names are hierarchical (".!frame.!label"), so a prefix test replaces walking the masters
+        widget_path, parent_path = str(widget), str(parent)
+        return widget_path == parent_path or widget_path.startswith(parent_path + ".")
 
     def close_dropdown(self, event):
         """
@@ -467,18 +734,34 @@ class Menus:
         Parameters:
         - event (tk.Event): The event object.
         """
-        if (
-            event is None
-            or not self.is_descendant(event.widget, self.menu_bar)
-            and not any(
-                self.is_descendant(event.widget, child.dropdown)
-                for child in self.menu_bar.winfo_children()
-                if isinstance(child, Button) and hasattr(child, "dropdown")
-            )
+        if self.open_dropdown is None:
+            return  # Nothing to close, the case of almost every click on the canvas
+        # Only one dropdown is shown at a time, so it is the only one a click can land in
+        if event is not None and (
+            self.is_descendant(event.widget, self.menu_bar) or self.is_descendant(event.widget, self.open_dropdown)
         ):
-            for child in self.menu_bar.winfo_children():
-                if isinstance(child, Button) and hasattr(child, "dropdown"):
-                    child.dropdown.place_forget()
+            return
+        self.open_dropdown.place_forget()
+        self.open_dropdown = None
+
+    def show_toast(self, message, duration=2000):
+        """
+        Shows a short notice at the bottom of the main window that closes by itself.
+        Used for confirmations that need no acknowledgement, errors keep their modal messagebox.
+
+        Parameters:
+        - message (str): The text to display.
+        - duration (int): Milliseconds before the notice closes.
+        """
+        toast = tk.Toplevel(self.parent)
+        toast.overrideredirect(True)  # No title bar or borders
+        tk.Label(toast, text=message, bg="#333333", fg="white", padx=20, pady=10, font=("FiraCode-Bold", 12)).pack()
+        toast.update_idletasks()  # Compute the requested size without processing other events
+        root = self.parent.winfo_toplevel()
+        x = root.winfo_rootx() + (root.winfo_width() - toast.winfo_reqwidth()) // 2
+        y = root.winfo_rooty() + root.winfo_height() - toast.winfo_reqheight() - 40
+        toast.geometry(f"+{x}+{y}")
+        toast.after(duration, toast.destroy)
 
     # Menu Handler Functions
     def new_file(self):
@@ -489,80 +772,76 @@ class Menus:
         self.board.fill_matrix_1260_pts()
         self.board.draw_blank_board_model()
 
-        print("New file created.")
-        messagebox.showinfo("Nouveau fichier", "Un nouveau circuit a été créé.")
+        logger.info("New file created.")
+        self.show_toast("Un nouveau circuit a été créé.")
 
     def open_file(self):
         """Handler for the 'Open' menu item."""
-        print("Open File")
+        logger.debug("Open File")
         file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
         if file_path:
             try:
-                with open(file_path, "r", encoding="utf-8") as file:
-                    circuit_data = json.load(file)
-                print(f"Circuit loaded from {file_path}")
-                self.board.sketcher.clear_board()
-
-                x_o, y_o = self.board.sketcher.id_origins["xyOrigin"]
-                self.board.sketcher.circuit(x_o, y_o, model=[])
+                circuit_data = read_circuit_file(file_path)
+                logger.info("Circuit loaded from %s", file_path)
+                sketcher = self.board.sketcher
+                sketcher.clear_board()
 
-                battery_pos_wire_end = None
-                battery_neg_wire_end = None
+                x_o, y_o = sketcher.id_origins["xyOrigin"]
+                sketcher.circuit(x_o, y_o, model=[])
 
-                for key, val in circuit_data.items():
-                    if key == "_battery_pos_wire":
-                        battery_pos_wire_end = val["end"]
-                    elif key == "_battery_neg_wire":
-                        battery_neg_wire_end = val["end"]
+                # The battery wire ends are needed before the components, look them up directly
+                battery_pos_wire = circuit_data.get("_battery_pos_wire")
+                battery_neg_wire = circuit_data.get("_battery_neg_wire")
 
                 self.board.draw_blank_board_model(
                     x_o,
                     y_o,
-                    battery_pos_wire_end=battery_pos_wire_end,
-                    battery_neg_wire_end=battery_neg_wire_end,
+                    battery_pos_wire_end=battery_pos_wire["end"] if battery_pos_wire else None,
+                    battery_neg_wire_end=battery_neg_wire["end"] if battery_neg_wire else None,
                 )
 
+                loaders = {"chip": self.load_chip, "io": self.load_io}
+                wires = []
                 for key, val in circuit_data.items():
-                    if "chip" in key:
-                        self.load_chip(val)
-
-                    elif "wire" in key and not key.startswith("_battery"):
-                        self.load_wire(val)
-
-                    elif "io" in key:
-                        self.load_io(val)
-
+                    kind = component_kind(key)
+                    if kind == "battery":
+                        continue  # Already drawn with the blank board
+                    if kind == "wire":
+                        # Consecutive wires are drawn together, in file order
+                        wires.append(val)
+                        continue
+                    if wires:
+                        self.load_wires(wires)
+                        wires = []
+
+                    loader = loaders.get(kind)
+                    if loader is not None:
+                        loader(val)
                     else:
-
-                        print(f"Unspecified component: {key}")
-                messagebox.showinfo("Ouvrir un fichier", f"Circuit chargé depuis {file_path}")
+                        logger.warning("Unspecified component: %s", key)
+                if wires:
+                    self.load_wires(wires)
+                self.show_toast(f"Circuit chargé depuis {file_path}")
                 self.open_file_path = file_path
             except Exception as e:
-                print(f"Error loading file: {e}")
+                logger.error("Error loading file: %s", e)
                 messagebox.showerror(
                     "Erreur d'ouverture", f"Une erreur s'est produite lors de l'ouverture du fichier:\n{e}"
                 )
                 raise e
         else:
-            print("Open file cancelled.")
+            logger.debug("Open file cancelled.")
 
     def load_chip(self, chip_data):
         """Load a chip from the given chip_data."""
+        sketcher = self.board.sketcher
         x, y = chip_data["XY"]
-        model_chip = [
-            (
-                self.board.sketcher.draw_chip,
-                1,
-                {
-                    **chip_data,
-                    "matrix": self.board.sketcher.matrix,
-                },
-            )
-        ]
-        self.board.sketcher.circuit(x, y, model=model_chip)
+        # The draw functions use the sketcher's own matrix and get the params unpacked, so no merged copy
+        model_chip = ((sketcher.draw_chip, 1, chip_data),)
+        sketcher.circuit(x, y, model=model_chip)
         new_chip_id = self.current_dict_circuit["last_id"]
 
-        (_, _), (column, line) = self.board.sketcher.find_nearest_grid(x, y, matrix=self.board.sketcher.matrix)
+        (_, _), (column, line) = sketcher.find_nearest_grid(x, y, matrix=sketcher.matrix)
         occupied_holes = []
         for i in range(chip_data["pinCount"] // 2):
             # Top row (line 7 or 21)
@@ -572,39 +851,24 @@ class Menus:
             occupied_holes.extend([hole_id_top, hole_id_bottom])
         self.current_dict_circuit[new_chip_id]["occupied_holes"] = occupied_holes
 
-    def load_wire(self, wire_data):
-        """Load a wire from the given wire_data."""
-        x_o, y_o = self.board.sketcher.id_origins["xyOrigin"]
-        model_wire = [
-            (
-                self.board.sketcher.draw_wire,
-                1,
-                {
-                    **wire_data,
-                    "matrix": self.board.sketcher.matrix,
-                },
-            )
-        ]
-        self.board.sketcher.circuit(x_o, y_o, model=model_wire)
+    def load_wires(self, wires_data):
+        """Load the wires from the given list of wire_data."""
+        sketcher = self.board.sketcher
+        x_o, y_o = sketcher.id_origins["xyOrigin"]
+        model_wires = ((sketcher.draw_wires, 1, {"wires": wires_data}),)
+        sketcher.circuit(x_o, y_o, model=model_wires)
 
     def load_io(self, io_data):
         """Load an input/output component from the given io_data."""
-        x_o, y_o = self.board.sketcher.id_origins["xyOrigin"]
-        model_io = [
-            (
-                self.board.sketcher.draw_pin_io,
-                1,
-                {
-                    **io_data,
-                    "matrix": self.board.sketcher.matrix,
-                },
-            )
-        ]
-        self.board.sketcher.circuit(x_o, y_o, model=model_io)
+        sketcher = self.board.sketcher
+        x_o, y_o = sketcher.id_origins["xyOrigin"]
+        # The draw functions use the sketcher's own matrix and get the params unpacked, so no merged copy
+        model_io = ((sketcher.draw_pin_io, 1, io_data),)
+        sketcher.circuit(x_o, y_o, model=model_io)
 
     def save_file(self, prompt_for_path: bool = True):
         """Handler for the 'Save' menu item."""
-        print("Save File")
+        logger.debug("Save File")
         if prompt_for_path or not self.open_file_path:
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".json", filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
@@ -613,222 +877,316 @@ class Menus:
             file_path = self.open_file_path
         if file_path:
             try:
-                circuit_data = deepcopy(self.current_dict_circuit)
-
-                circuit_data.pop("last_id", None)
-                for key, comp_data in circuit_data.items():
-                    comp_data.pop("id", None)
-                    comp_data.pop("tags", None)
+                # Shallow per-component copies: only the dropped keys differ, nested values are shared
+                circuit_data = {}
+                for key, comp_data in self.current_dict_circuit.items():
+                    if key == "last_id":
+                        continue
+                    skipped_keys = SAVE_SKIPPED_KEYS_BY_KIND.get(component_kind(key), SAVE_SKIPPED_KEYS)
+                    comp_data = {k: v for k, v in comp_data.items() if k not in skipped_keys}
                     if "label" in comp_data:
                         comp_data["label"] = comp_data["type"]
-                    if "wire" in key:
-                        comp_data.pop("XY", None)  # Remove XY, will be recalculated anyway
-                    if key == "_battery":
-                        comp_data.pop("battery_rect", None)
+                    circuit_data[key] = comp_data
                 # Save the data to a JSON file
-                with open(file_path, "w", encoding="utf-8") as file:
-                    json.dump(circuit_data, file, indent=4)
-                print(f"Circuit saved to {file_path}")
-                messagebox.showinfo("Sauvegarde réussie", f"Circuit sauvegardé dans {file_path}")
+                write_circuit_file(file_path, circuit_data)
+                logger.info("Circuit saved to %s", file_path)
+                self.show_toast(f"Circuit sauvegardé dans {file_path}")
                 self.open_file_path = file_path
             except (TypeError, KeyError) as e:
-                print(f"Error saving file: {e}")
+                logger.error("Error saving file: %s", e)
                 messagebox.showerror(
                     "Erreur de sauvegarde", f"Une erreur s'est produite lors de la sauvegarde du fichier:\n{e}"
                 )
         else:
-            print("Save file cancelled.")
+            logger.debug("Save file cancelled.")
+
+    def run_in_worker(self, work, callback, on_error=None, poll_ms=50):
+        """
+        Runs work() in a worker thread and passes its result to callback on the Tk thread.
+        Tk must only be called from the thread running mainloop, so the worker puts the result
+        on a queue that the Tk thread polls with parent.after.
+
+        Parameters:
+        - work (Callable[[], T]): The slow call, must not touch Tk.
+        - callback (Callable[[T], None]): Receives the result of work when it returns.
+        - on_error (Callable[[Exception], None] | None): Receives the exception when work raises, on the Tk thread.
+          The exception is logged in any case.
+        - poll_ms (int): Delay between two checks of the queue, in milliseconds.
+        """
+        results = queue.Queue(maxsize=1)
+
+        def run():
+            try:
+                results.put((True, work()))
+            except Exception as e:  # pylint: disable=broad-exception-caught  # Reported on the Tk thread
+                logger.exception("Erreur dans la tâche de fond")
+                results.put((False, e))
+
+        def poll():
+            try:
+                done, result = results.get_nowait()
+            except queue.Empty:
+                self.parent.after(poll_ms, poll)
+                return
+            if done:
+                callback(result)
+            elif on_error is not None:
+                on_error(result)
+
+        threading.Thread(target=run, daemon=True).start()
+        self.parent.after(poll_ms, poll)
+
+    def list_com_ports(self, callback, refresh=False):
+        """
+        Passes the available COM port devices to callback, on the Tk thread.
+        The enumeration is slow on Windows: it is reused for PORTS_CACHE_TTL seconds unless refresh is set,
+        and otherwise runs in a worker thread so the window stays responsive.
+
+        Parameters:
+        - callback (Callable[[list[str]], None]): Receives the port devices.
+        - refresh (bool): Ignore the cached enumeration.
+        """
+        cache = self.ports_cache
+        if not refresh and cache and time.monotonic() - cache[0] < PORTS_CACHE_TTL:
+            callback(cache[1])
+            return
+
+        def store_ports(options):
+            self.ports_cache = (time.monotonic(), options)
+            callback(options)
+
+        # A failed enumeration is reported like an empty one
+        self.run_in_worker(fast_list_com_ports, store_ports, on_error=lambda e: callback([]))
 
     def configure_ports(self):
         """Handler for the 'Configure Ports' menu item."""
-        print("Configure Ports")
-        options = [comport.device for comport in serial.tools.list_ports.comports()]
-        if len(options) == 0:
-            message = "No COM ports available. Please connect a device and try again."
-            print(message)
-            messagebox.showwarning("Pas de ports COM", message)
-        else:
-            dialog = tk.Toplevel(self.parent)
-            dialog.title("Configure Ports")
+        logger.debug("Configure Ports")
+        # The dialog opens right away, the combobox is filled once the ports are listed
+        dialog = tk.Toplevel(self.parent)
+        dialog.title("Configure Ports")
 
-            dialog.geometry("300x150")
+        dialog.geometry("300x190")
 
-            label = tk.Label(dialog, text="Select an option:")
-            label.pack(pady=10)
-            combobox = ttk.Combobox(dialog, values=options)
-            combobox.pack(pady=10)
+        label = tk.Label(dialog, text="Recherche des ports...")
+        label.pack(pady=10)
+        combobox = ttk.Combobox(dialog, values=[])
+        combobox.pack(pady=10)
 
-            def confirm_selection():
-                selected_option = combobox.get()
-                print(f"Selected option: {selected_option}")
-                self.serial_port.com_port = selected_option
+        def show_ports(options):
+            if not dialog.winfo_exists():
+                return  # Closed before the enumeration finished
+            if len(options) == 0:
+                message = "No COM ports available. Please connect a device and try again."
+                logger.warning(message)
                 dialog.destroy()
+                messagebox.showwarning("Pas de ports COM", message)
+                return
+            label.config(text="Select an option:")
+            combobox.config(values=options)
+            confirm_button.config(state="normal")
+
+        def confirm_selection():
+            selected_option = combobox.get()
+            if not selected_option:
+                return  # Nothing chosen yet, keep the current port and its connection
+            logger.info("Selected port: %s", selected_option)
+            if selected_option != self.serial_port.com_port:
+                self.close_port()  # The next upload opens the newly selected port
+            self.serial_port.com_port = selected_option
+            dialog.destroy()
 
-            confirm_button = Button(dialog, text="Confirm", command=confirm_selection)
-            confirm_button.pack(pady=10)
+        def refresh_ports():
+            label.config(text="Recherche des ports...")
+            self.list_com_ports(show_ports, refresh=True)
+
+        # Enabled by show_ports once the combobox has ports to choose from
+        confirm_button = Button(dialog, text="Confirm", command=confirm_selection, state="disabled")
+        confirm_button.pack(pady=10)
+        refresh_button = Button(dialog, text="Rafraîchir", command=refresh_ports)
+        refresh_button.pack()
+
+        self.list_com_ports(show_ports)
 
     def open_documentation(self):
         """Handler for the 'Documentation' menu item."""
-        file_path = os.path.join(os.path.dirname(__file__), "Assets", "ArduinoLogique_Document_utilisateur.pdf")
-        if platform.system() == "Windows":
-            subprocess.Popen(["start", file_path], shell=True)
-        elif platform.system() == "Darwin":  # macOS
-            subprocess.Popen(["open", file_path])
-        else:  # Linux and other Unix-like systems
-            subprocess.Popen(["xdg-open", file_path])
+        file_path = str(DOCUMENTATION_PATH)
+
+        def launch_viewer():
+            if sys.platform == "win32":
+                os.startfile(file_path)  # Opens the associated viewer without spawning cmd.exe
+            elif sys.platform == "darwin":  # macOS
+                subprocess.Popen(["open", file_path])
+            else:  # Linux and other Unix-like systems
+                subprocess.Popen(["xdg-open", file_path])
+
+        # Starting the viewer can take a while, the menu stays responsive meanwhile
+        threading.Thread(target=launch_viewer, daemon=True).start()
 
     def about(self):
         """Handler for the 'About' menu item."""
-        print("About this software")
+        logger.debug("About this software")
         messagebox.showinfo("À propos", "ArduinoLogique v1.0\nSimulateur de circuits logiques")
 
     def send_data(self, data):
         """
         Send a string of data to the microcontroller through the serial port.
+        Returns True if the data was written.
         """
         if self.serial_port.connection and self.serial_port.connection.is_open:
             try:
+                # The connection is reused between uploads: drop any late reply so readline gets this one
+                self.serial_port.connection.reset_input_buffer()
                 # Convertir la chaîne en bytes et l'envoyer
                 self.serial_port.connection.write(data.encode('utf-8'))
-                print(f"Données envoyées: {data}")
+                logger.debug("Données envoyées: %s", data)
                 #time.sleep(0.5) 
                 #if self.serial_port.connection.in_waiting > 0:  # Vérifie s'il y a des données disponibles
-                data = self.serial_port.connection.readline().decode('utf-8').strip() 
-                print(f"réponse: {data} à {self.serial_port.baud_rate} bauds")
+                # The board resets when the port opens, its boot output may not be valid UTF-8
+                data = self.serial_port.connection.readline().decode('utf-8', errors='replace').strip()
+                logger.debug("réponse: %s à %s bauds", data, self.serial_port.baud_rate)
+                return True
             except serial.SerialException as e:
-                print(f"Erreur lors de l'envoi des données: {e}")
+                logger.error("Erreur lors de l'envoi des données: %s", e)
         else:
-            print("Le port série n'est pas ouvert. Impossible d'envoyer les données.")
+            logger.error("Le port série n'est pas ouvert. Impossible d'envoyer les données.")
+        return False
+
+    def close_port(self, timeout=0.5):
+        """
+        Close the serial port if it is open. Called on the Tk thread: if an upload still holds the port
+        after timeout seconds, the port is left open rather than freezing the window.
+
+        Parameters:
+        - timeout (float): Seconds to wait for an upload in progress.
+        """
+        if not self.serial_lock.acquire(timeout=timeout):
+            logger.warning("Téléversement en cours, le port série %s n'est pas fermé.", self.serial_port.com_port)
+            return
+        try:
+            if self.serial_port.connection and self.serial_port.connection.is_open:
+                self.serial_port.connection.close()
+                logger.info("Port série %s fermé.", self.serial_port.com_port)
+            else:
+                logger.debug("Le port série est déjà fermé.")
+        finally:
+            self.serial_lock.release()
+
+    def shutdown(self):
+        """Handler for 'Quitter' and the window close button: closes the serial port, then the application."""
+        self.close_port()
+        self.parent.quit()
 
-    def close_port(self):
-        """Upload the script to the microcontroller through the serial port."""
-        if self.serial_port.connection and self.serial_port.connection.is_open:
-            self.serial_port.connection.close()
-            print(f"Port série {self.serial_port.com_port} fermé.")
-        else:
-            print("Le port série est déjà fermé.")
-            
     def download_script(self):
         self.checkCircuit()
-        self.serial_port.connect()
-        self.send_data(self.script)
-        #self.close_port()
-        
+        # Opening the port resets Arduino boards (1-2 s), so the upload runs outside the Tk thread
+        script = self.script
+        self.run_in_worker(
+            lambda: self.upload_script(script), self.report_upload, on_error=lambda e: self.report_upload(False)
+        )
+
+    def upload_script(self, script):
+        """
+        Opens the serial port if needed and sends the script. Runs in a worker thread, so it must not touch Tk.
+
+        Parameters:
+        - script (str): The circuit script built by checkCircuit.
+
+        Returns:
+        - bool: True if the board acknowledged the script.
+        """
+        with self.serial_lock:  # One upload at a time, and the port cannot be closed mid-write
+            self.serial_port.ensure_open()
+            return self.send_data(script)
+
+    def report_upload(self, sent):
+        """
+        Tells the user how the upload went, on the Tk thread.
+
+        Parameters:
+        - sent (bool): The result of upload_script.
+        """
+        if sent:
+            self.show_toast("Téléversement terminé.")
+        else:
+            messagebox.showerror(
+                "Téléversement", "Le script n'a pas pu être téléversé, vérifiez le port série."
+            )
+
     def is_linked_to(self, dest, src):
-        res = False
         c, l = src
-        for zone in dest:
-            c1, l1,c2, l2 = zone
-            if (c >= c1 and c<= c2 and l >= l1 and l<= l2):
-                res = True
-                break
-        return res
+        return any(c1 <= c <= c2 and l1 <= l <= l2 for c1, l1, c2, l2 in dest)
+
+    def zone_points(self, zone):
+        """
+        Returns the points (col, line) covered by a zone, computed once per circuit check.
+        Zones must not change while link_index is in use, it is reset by checkCircuit.
+        """
+        entry = self.link_index.get(id(zone))
+        if entry is None:
+            points = frozenset(
+                (c, l) for c1, l1, c2, l2 in zone for c in range(c1, c2 + 1) for l in range(l1, l2 + 1)
+            )
+            entry = self.link_index[id(zone)] = (zone, points)
+        return entry[1]
+
+    def linked(self, zone, pt):
+        """Same test as is_linked_to, against the cached points of the zone (see zone_points)."""
+        return pt in self.zone_points(zone)
+
+    def zones_by_point(self, zones):
+        """Returns {point: n} for the points of the zones, n being the index of the first zone covering the point."""
+        index = {}
+        for n, zone in enumerate(zones):
+            for pt in self.zone_points(zone):
+                index.setdefault(pt, n)
+        return index
     
     def decodeFunc(self,inVar, funcName):
         s =""
-        if funcName == "NandGate":
-            s = f"!( {inVar[0]['val']} "
-            for v in inVar[1:]:
-                s += f"& {v['val']} "
-            s += ") "
-        elif funcName == "AndGate":
-            s = f"( {inVar[0]['val']} "
-            for v in inVar[1:]:
-                s += f"& {v['val']} "
-            s += ") "   
-        elif funcName == "NorGate":
-            s = f"! ( {inVar[0]['val']} "
-            for v in inVar[1:]:
-                s += f"| {v['val']} "
-            s += ") "         
-        elif funcName == "OrGate":
-            s = f"( {inVar[0]['val']} "
-            for v in inVar[1:]:
-                s += f"| {v['val']} "
-            s += ") "         
-        elif funcName == "NotGate":
-            s = f"! {inVar[0]['val']} "
-        elif funcName == "XorGate":
-            s = f"( {inVar[0]['val']} "
-            for v in inVar[1:]:
-                s += f"^ {v['val']} "
-            s += ") "  
-        elif funcName == "XnorGate":
-            s = f"! ( {inVar[0]['val']} "
-            for v in inVar[1:]:
-                s += f"| {v['val']} "
-            s += ") "  
-        elif funcName == "Mux":  
-            e =["( ","( ","( ","( ","( ","( ","( ","( "]
-            for v in range(8):
-                v2, v1, v0  = (v & 1)^1, ((v & 2) >> 1)^1, ((v & 4) >> 2)^1
-                e[v] += inVar[v]['val'] + " & " + inVar[11]["einv"] + " & " + \
-                        v0*" !" + inVar[8]["sel"] + " & " + v1*" !" + inVar[9]["sel"] + " & " + v2*" !" + inVar[10]["sel"] + " ) "
-            s = " ( " + e[0]
-            for et in e[1:]:
-                s += "| " + et
-            s += " ) "
-        elif funcName == "Demux":  
-            s ="("
-            out = inVar[0]['numO']
-            v2, v1, v0  = (out & 1)^1, ((out & 2) >> 1)^1, ((out & 4) >> 2)^1
-            s += v0*" !" + inVar[0]['val'] + " & " + v1*"!" + inVar[1]['val'] + " & " + v2*"!" + inVar[2]['val'] + \
-                 " & " + inVar[3]["einv"] + " & " + inVar[4]["einv"] + " & " + inVar[5]["enb"]
-            s += " ) "
-        elif funcName == "DFlipFlop":  
-            s ="("
-            s += inVar[0]['val'] + " & CLK & " + inVar[3]['iset'] + " & " + inVar[2]['irst'] + " | !" + inVar[3]['iset']
-            s += " ) "
+        template = GATE_TEMPLATES.get(funcName)
+        if template is not None:
+            prefix, separator, suffix = template
+            s = prefix + separator.join([v['val'] for v in inVar]) + suffix
+        elif funcName in EXPRESSION_BUILDERS:
+            s = EXPRESSION_BUILDERS[funcName](inVar)
         elif funcName == "JKFlipFlop":  
-            if inVar[4].get('iK'): 
-                    K = f"!{inVar[4]['iK']}"
-            else:   K = inVar[4]["K"]
-            if inVar[1].get('clk'): 
-                    CLK = f"{inVar[1]['clk']} "
-            else:   CLK = f"!{inVar[3]['iclk']} "
-            if inVar[3].get('iset'): 
-                    set = f"!{inVar[3]['iset']}"
-                    iset = f"{inVar[3]['iset']}"
+            iK, clk, iset = inVar[4].get('iK'), inVar[1].get('clk'), inVar[3].get('iset')
+            K = f"!{iK}" if iK else inVar[4]["K"]
+            CLK = f"{clk} " if clk else f"!{inVar[3]['iclk']} "
+            if iset:
                     rst = f"!{inVar[2]['irst']}"
-            else:   
-                    set = f"!{inVar[2]['iset']}"
-                    iset = f"{inVar[2]['iset']}"
+            else:
+                    iset = inVar[2]['iset']
                     rst = f"!{inVar[1]['irst']}"
-            sT =f"T{self.varTempNum} = "
-            sT += "((" + inVar[0]['J'] + f" & !T{self.varTempNum}_precedent) | (!{K} & T{self.varTempNum}_precedent)) & {set} & {rst} & CLK | {iset} " 
-            sT += " ); "
+            set = f"!{iset}"
+            prec = f"T{self.varTempNum}_precedent"
+            sT = f"T{self.varTempNum} = (({inVar[0]['J']} & !{prec}) | (!{K} & {prec})) " \
+                 f"& {set} & {rst} & CLK | {iset}  ); "
             s = inVar[0]['numO']*" !" + f"T{self.varTempNum} "
             self.varTempNum +=1
-            self.varScript += [sT]
+            self.varScript.append(sT)
         elif funcName == "BinaryCounter": 
             if inVar[0]['numO'] == 0:
                 self.numTemp = []
                 CE = inVar[6]["CE"]
                 iU = inVar[8]["iU"]
                 iL = inVar[7]["iL"]
-                D0 = inVar[0]["val"]
-                D1 = inVar[1]["val"]
-                D2 = inVar[0]["val"]
-                D3 = inVar[0]["val"]
-                sT = f"T{self.varTempNum} = clk & {CE} & {iL} & !T{self.varTempNum}_precedent | !{iL} & {D0} & clk | !{CE} & {iL} & clk & T{self.varTempNum}_precedent; "
-                self.numTemp += [self.varTempNum]
-                self.varTempNum +=1
-                self.varScript += [sT]
-                sT = f"T{self.varTempNum} = (!{CE} | !T{self.varTempNum-1}_precedent | !T{self.varTempNum}_precedent) & " \
-                    + f"({CE} & T{self.varTempNum - 1}_precedent | T{self.varTempNum}_precedent ) & {iL} & clk  | !{iL} & {D1} & clk | !{CE} & {iL} & clk & T{self.varTempNum}_precedent; "
-                self.numTemp += [self.varTempNum]
-                self.varTempNum +=1
-                self.varScript += [sT]
-                sT = f"T{self.varTempNum} = (!{CE} | !T{self.varTempNum-2}_precedent | !T{self.varTempNum-1}_precedent | !T{self.varTempNum}_precedent) & clk & " \
-                    + f"({CE} & T{self.varTempNum - 2}_precedent & T{self.varTempNum - 1}_precedent | T{self.varTempNum}_precedent ) & {iL} & clk  | !{iL} & {D2} & clk  | !{CE} & {iL} & clk  & T{self.varTempNum}_precedent; "
-                self.numTemp += [self.varTempNum]
-                self.varTempNum +=1
-                self.varScript += [sT]
-                sT = f"T{self.varTempNum} = (!{CE} | !T{self.varTempNum-3}_precedent  | !T{self.varTempNum-2}_precedent | !T{self.varTempNum-1}_precedent | !T{self.varTempNum}_precedent) & " \
-                    + f"({CE} & T{self.varTempNum - 3}_precedent & T{self.varTempNum - 2}_precedent & T{self.varTempNum - 1}_precedent | T{self.varTempNum}_precedent ) & {iL} & clk  | !{iL} & {D3} & clk  | !{CE} & {iL} & clk  & T{self.varTempNum}_precedent; "
-                self.numTemp += [self.varTempNum]
-                self.varTempNum +=1
-                self.varScript += [sT]
+                D = [inVar[i]["val"] for i in range(4)]
+                t = self.varTempNum
+                prev = [f"T{t + i}_precedent" for i in range(4)]
+                load_hold = f"{iL} & clk"
+                lines = []
+                for i in range(4):
+                    # Le bit i bascule quand CE et les bits inférieurs sont à 1, charge D[i] quand iL est à 0
+                    not_carry = " | ".join([f"!{CE}"] + [f"!{p}" for p in prev[:i + 1]])
+                    carry = " & ".join([CE] + prev[:i])
+                    lines.append(
+                        f"T{t + i} = ({not_carry}) & ({carry} | {prev[i]} ) & {load_hold} "
+                        f"| !{iL} & {D[i]} & clk | !{CE} & {load_hold} & {prev[i]}; "
+                    )
+                self.numTemp += range(t, t + 4)
+                self.varTempNum += 4
+                self.varScript.extend(lines)
             s = f"T{self.numTemp[inVar[0]['numO']]} " 
 
         return s                 
@@ -837,311 +1195,62 @@ class Menus:
         #id, (c1,l1,c2,l2)  = ioOut 
         id, [ioZone] = ioOut
         #ioZone = [(c1,l1,c2,l2)]
-        chip_select = params.get("chip_select", [])
-        chip_out_inv =  params.get("chip_out_inv", [])
-        chip_in_enable = params.get("chip_in_enable", [])
-        chip_in_enable_inv =  params.get("chip_in_enable_inv", [])
-        chip_in_clock =  params.get("chip_in_clock", [])
-        chip_in_inv_reset = params.get("chip_in_inv_reset", [])
-        chip_in_inv_set = params.get("chip_in_inv_set", [])   
-        chip_in_inv_clock = params.get("chip_in_inv_clock", [])   
-        chip_in_j = params.get("chip_in_j", [])
-        chip_in_k = params.get("chip_in_k", [])
-        chip_in_inv_k = params.get("chip_in_inv_k", [])
-        
-        chip_in_ce = params.get("count_enable_pin", [])
-        chip_in_inv_L = params.get("inv_load_enable_pin", [])
-        chip_in_inv_U = params.get("inv_up_down_input_pin", [])
-        chip_out_TC = params.get("terminal_count_pin", [])  
-              
         findOut = False
         circuitClose = True
         script = ""
         #chip_out_checked = []
         
         for nf,f in enumerate(self.func):
-            idOut, inLst, fName, outLst = deepcopy(f)
-            if chip_select:
-                  chipSel = chip_select  
-                  chipSel = [list(chipS[1:]) for chipS in chipSel if chipS[0] == idOut]
-                  if chipSel:
-                      [chipSel] = chipSel
-            else: chipSel = []
-            
-            if chip_in_enable_inv:
-                  chipEnInv = chip_in_enable_inv  
-                  chipEnInv = [list(chipEI[1:]) for chipEI in chipEnInv if chipEI[0] == idOut]
-                  if chipEnInv:
-                      [chipEnInv] = chipEnInv
-            else: chipEnInv = []
-            
-            if chip_in_enable:
-                  chipEn = chip_in_enable  
-                  chipEn = [list(chipE[1:]) for chipE in chipEn if chipE[0] == idOut]
-                  if chipEn:
-                      [chipEn] = chipEn
-            else: chipEn = []
-            
-            if chip_in_clock:
-                  chipInClock = chip_in_clock 
-                  chipInClock = [list(chipICLK[1:]) for chipICLK in chipInClock if chipICLK[0] == idOut]
-                  if chipInClock:
-                      [chipInClock] =chipInClock
-                  chipInClock = [(c1,l1) for (c1,l1,nfunc) in chipInClock if nfunc == nf]
-            else: chipInClock = []
-
-            if chip_in_inv_reset:
-                  chipInInvReset = chip_in_inv_reset 
-                  chipInInvReset = [list(chipInInvR[1:]) for chipInInvR in chipInInvReset if chipInInvR[0] == idOut]
-                  if chipInInvReset:
-                      [chipInInvReset] = chipInInvReset
-                  chipInInvReset = [(c1,l1) for (c1,l1,nfunc) in chipInInvReset if nfunc == nf]
-            else: chipInInvReset = []
-
-            if chip_in_inv_set:
-                  chipInInvSet = chip_in_inv_set 
-                  chipInInvSet = [list(chipInInvS[1:]) for chipInInvS in chipInInvSet if chipInInvS[0] == idOut]
-                  if chipInInvSet:
-                      [chipInInvSet] = chipInInvSet                  
-                  chipInInvSet = [(c1,l1) for (c1,l1,nfunc) in chipInInvSet if nfunc == nf]
-            else: chipInInvSet = []
-
-            if chip_in_inv_clock:
-                  chipInInvClk = chip_in_inv_clock 
-                  chipInInvClk = [list(chipInIClk[1:]) for chipInIClk in chipInInvClk if chipInIClk[0] == idOut]
-                  if chipInInvClk:
-                      [chipInInvClk] = chipInInvClk
-                  chipInInvClk = [(c1,l1) for (c1,l1,nfunc) in chipInInvClk if nfunc == nf]
-            else: chipInInvClk = []
-            
-            if chip_in_j:
-                  chipInJ = chip_in_j 
-                  chipInJ = [list(chipIJ[1:]) for chipIJ in chipInJ if chipIJ[0] == idOut]
-                  if chipInJ:
-                      [chipInJ] = chipInJ
-                  chipInJ = [(c1,l1) for (c1,l1,nfunc) in chipInJ if nfunc == nf]
-            else: chipInJ = []
-            
-            if chip_in_k:
-                  chipInK = chip_in_k 
-                  chipInK = [list(chipIK[1:]) for chipIK in chipInK if chipIK[0] == idOut]
-                  if chipInK:
-                      [chipInK] = chipInK
-                  chipInK = [(c1,l1) for (c1,l1,nfunc) in chipInK if nfunc == nf]
-            else: chipInK = []
-            
-            if chip_in_inv_k:
-                  chipInInvK = chip_in_inv_k 
-                  chipInInvK = [list(chipIIK[1:]) for chipIIK in chipInInvK if chipIIK[0] == idOut]
-                  if chipInInvK:
-                      [chipInInvK] = chipInInvK
-                  chipInInvK = [(c1,l1) for (c1,l1,nfunc) in chipInInvK if nfunc == nf]
-            else: chipInInvK = []
-        
-            if chip_in_ce:
-                  chipInCE = chip_in_ce 
-                  chipInCE = [list(chipICE[1:]) for chipICE in chipInCE if chipICE[0] == idOut]
-                  if chipInCE:
-                      [chipInCE] = chipInCE
-                  chipInCE = [(c1,l1) for (c1,l1,nfunc) in chipInCE if nfunc == nf]
-            else: chipInCE = []
-            
-            if chip_in_inv_L:
-                  chipInInvL = chip_in_inv_L 
-                  chipInInvL = [list(chipIIL[1:]) for chipIIL in chipInInvL if chipIIL[0] == idOut]
-                  if chipInInvL:
-                      [chipInInvL] = chipInInvL
-                  chipInInvL = [(c1,l1) for (c1,l1,nfunc) in chipInInvL if nfunc == nf]
-            else: chipInInvL = []
-            
-            if chip_in_inv_U:
-                  chipInInvU = chip_in_inv_U 
-                  chipInInvU = [list(chipIIU[1:]) for chipIIU in chipInInvU if chipIIU[0] == idOut]
-                  if chipInInvU:
-                      [chipInInvU] = chipInInvU
-                  chipInInvU = [(c1,l1) for (c1,l1,nfunc) in chipInInvU if nfunc == nf]
-            else: chipInInvU = []
-            
-            if chip_out_TC:
-                  chipOutTC = chip_out_TC 
-                  chipOutTC = [list(chipOTC[1:]) for chipOTC in chipOutTC if chipOTC[0] == idOut]
-                  if chipOutTC:
-                      [chipOutTC] = chipOutTC
-                  chipOutTC = [(c1,l1) for (c1,l1,nfunc) in chipOutTC if nfunc == nf]
-            else: chipOutTC = []
-
-            if chip_out_inv:
-                  chipOutInv = chip_out_inv 
-                  chipOutInv = [list(chipOI[1:]) for chipOI in chipOutInv if chipOI[0] == idOut]
-                  if chipOutInv:
-                      [chipOutInv] = chipOutInv
-            else: chipOutInv = []
-            
-            inLst += chipSel  + chipEnInv + chipEn + chipInClock + chipInInvReset + chipInInvSet + \
-                     chipInInvClk + chipInK + chipInInvK + chipInCE + chipInInvL + chipInInvU 
+            idOut, inLst, fName, outLst = f
+            inLst, outLst = list(inLst), list(outLst)
+            pins = {
+                key: chip_pins(params.get(param, []), idOut, nf if per_function else None)
+                for param, key, per_function in CHIP_INPUT_KEYS
+            }
+            chipOutInv = chip_pins(params.get("chip_out_inv", []), idOut)
+            chipOutTC = chip_pins(params.get("terminal_count_pin", []), idOut, nf)
+
+            # Entrées ajoutées dans l'ordre attendu par decodeFunc, J fait déjà partie des entrées de la fonction
+            inLst += [pin for key in CHIP_EXTRA_INPUTS for pin in pins[key]]
             outLst += chipOutInv + chipOutTC
+            # Clé de decodeFunc associée à chaque broche d'entrée, la dernière liste l'emporte
+            in_key_map = {pin: key for key, key_pins in pins.items() for pin in key_pins}
+            pwr_key_map = {pin: key for key, key_pins in pins.items() if key != "clk" for pin in key_pins}
+            out_key_map = {pin: key for key in ("sel", "einv", "enb") for pin in pins[key]}
+            out_key_map.update(dict.fromkeys(chipOutTC, "TC"))
+            inv_enable = set(pins["einv"])
             for no,out in enumerate(outLst):
                 #if out not in chip_out_checked:
-                    if self.is_linked_to(ioZone, out): 
+                    if self.linked(ioZone, out): 
                         findOut = True
                         #self.script += "( "
                         #chip_out_checked += [out]
                         inFuncConst = []
                         for n,inFunc in enumerate(inLst):
                             findIn = False
-                            if  self.is_linked_to(self.pwrP, inFunc) or self.is_linked_to(self.pwrM, inFunc):
-                                constKey = 'val'
-                                pos, neg = "1", "0"
-                                for c in chipSel:
-                                    if c == inFunc:
-                                        constKey = "sel"
-                                for c in chipEnInv:
-                                    if c == inFunc:
-                                        constKey = "einv"
-                                        pos, neg = "0", "1"
-                                for c in chipEn:
-                                    if c == inFunc:
-                                        constKey = "enb"
-                                for c in chipInInvReset:
-                                    if c == inFunc:
-                                        constKey = 'irst'
-                                for c in chipInInvSet:
-                                    if c == inFunc:
-                                        constKey = 'iset'
-                                        
-                                for c in chipInInvClk:
-                                    if c == inFunc:
-                                        constKey = 'iclk'
-                                for c in chipInJ:
-                                    if c == inFunc:
-                                        constKey = "J"
-                                for c in chipInK:
-                                    if c == inFunc:
-                                        constKey = "K"
-                                for c in chipInInvK:
-                                    if c == inFunc:
-                                        constKey = "iK"
-
-                                for c in chipInCE:
-                                    if c == inFunc:
-                                        constKey = "CE"
-                                for c in chipInInvL:
-                                    if c == inFunc:
-                                        constKey = "iL"
-                                for c in chipInInvU:
-                                    if c == inFunc:
-                                        constKey = "iU"
-
-
-                                if self.is_linked_to(self.pwrP, inFunc):
-                                        inFuncConst += [{constKey:pos, "num":n, 'numO':no}]
-                                else:   inFuncConst += [{constKey:neg, "num":n, 'numO':no}]
+                            on_pwrP = self.linked(self.pwrP, inFunc)
+                            if on_pwrP or self.linked(self.pwrM, inFunc):
+                                constKey = pwr_key_map.get(inFunc, 'val')
+                                pos, neg = ("0", "1") if inFunc in inv_enable else ("1", "0")
+                                if on_pwrP:
+                                        inFuncConst.append({constKey:pos, "num":n, 'numO':no})
+                                else:   inFuncConst.append({constKey:neg, "num":n, 'numO':no})
                                 findIn = True
                                 print("connecté à pwr")
                             if not findIn:
-                                for n_io,io_inZone in enumerate(self.io_in):
-                                    id, [zone] = io_inZone
-                                    if self.is_linked_to(zone, inFunc):
-                                        constKey = 'val'
-                                        for c in chipSel:
-                                            if c == inFunc:
-                                                constKey = "sel"
-                                        for c in chipEnInv:
-                                            if c == inFunc:
-                                                constKey = "einv"
-                                        for c in chipEn:
-                                            if c == inFunc:
-                                                constKey = "enb"
-                                        for c in chipInInvReset:
-                                            if c == inFunc:
-                                                constKey = 'irst'
-                                        for c in chipInInvSet:
-                                            if c == inFunc:
-                                                constKey = 'iset'
-                                        for c in chipInClock:
-                                            if c == inFunc:
-                                                constKey = 'clk'
-                                                
-                                        for c in chipInInvClk:
-                                            if c == inFunc:
-                                                constKey = 'iclk'
-                                        for c in chipInJ:
-                                            if c == inFunc:
-                                                constKey = "J"
-                                        for c in chipInK:
-                                            if c == inFunc:
-                                                constKey = "K"
-                                        for c in chipInInvK:
-                                            if c == inFunc:
-                                                constKey = "iK"
-                                                
-                                        for c in chipInCE:
-                                            if c == inFunc:
-                                                constKey = "CE"
-                                        for c in chipInInvL:
-                                            if c == inFunc:
-                                                constKey = "iL"
-                                        for c in chipInInvU:
-                                            if c == inFunc:
-                                                constKey = "iU"
-                                                
-                                        #inFuncConst += [{constKey:self.mcu_pin[f"I{id[4:]}"], "num":n, "numO":no}] # [self.mcu_pin[f"I{id[4:]}"]] # ici ajouter n 
-                                        inFuncConst += [{constKey:f"I{n_io+1}", "num":n_io, "numO":no}] # [self.mcu_pin[f"I{id[4:]}"]] # ici ajouter n 
-                                        findIn = True
-                                        print("connecté à une ENTRÉE EXTERNE")
-                                        break
+                                n_io = self.io_in_by_point.get(inFunc)
+                                if n_io is not None:
+                                    constKey = in_key_map.get(inFunc, 'val')
+                                    inFuncConst.append({constKey:f"I{n_io+1}", "num":n_io, "numO":no})
+                                    findIn = True
+                                    print("connecté à une ENTRÉE EXTERNE")
                             if not findIn:
-                                for n_io, io_chipInZone in enumerate(self.chip_in_wire):
-                                    id, zone = io_chipInZone
-                                    if self.is_linked_to(zone, inFunc):
-                                        constKey = 'val'
-                                        for c in chipSel:
-                                            if c == inFunc:
-                                                constKey = "sel"
-                                        for c in chipEnInv:
-                                            if c == inFunc:
-                                                constKey = "einv"
-                                        for c in chipEn:
-                                            if c == inFunc:
-                                                constKey = "enb"
-                                        for c in chipInInvReset:
-                                            if c == inFunc:
-                                                constKey = 'irst'
-                                        for c in chipInInvSet:
-                                            if c == inFunc:
-                                                constKey = 'iset'
-                                        for c in chipInClock:
-                                            if c == inFunc:
-                                                constKey = 'clk'
-                                                
-                                        for c in chipInInvClk:
-                                            if c == inFunc:
-                                                constKey = 'iclk'
-                                        for c in chipInJ:
-                                            if c == inFunc:
-                                                constKey = "J"
-                                        for c in chipInK:
-                                            if c == inFunc:
-                                                constKey = "K"
-                                        for c in chipInInvK:
-                                            if c == inFunc:
-                                                constKey = "iK"
-                                                
-                                        for c in chipInCE:
-                                            if c == inFunc:
-                                                constKey = "CE"
-                                        for c in chipInInvL:
-                                            if c == inFunc:
-                                                constKey = "iL"
-                                        for c in chipInInvU:
-                                            if c == inFunc:
-                                                constKey = "iU"
-                                                
-                                        #inFuncConst += [{constKey:self.mcu_pin[f"I{id[4:]}"], "num":n, "numO":no}]
-                                        inFuncConst += [{constKey:f"I{n_io+1}", "num":n_io, "numO":no}]
-                                        findIn = True
-                                        print("connecté à une ENTRÉE EXTERNE par cable") # ici ajouter n {'val':self.mcu_pin[f"I{id[4:]}"], "num":n}
-                                        break
+                                n_io = self.chip_in_wire_by_point.get(inFunc)
+                                if n_io is not None:
+                                    constKey = in_key_map.get(inFunc, 'val')
+                                    inFuncConst.append({constKey:f"I{n_io+1}", "num":n_io, "numO":no})
+                                    findIn = True
+                                    print("connecté à une ENTRÉE EXTERNE par cable")
                                     
                             if not findIn:      ## recherche d'une sortie de chip connectée à l'entrée actuelle de la chip
                                 findNext =False
@@ -1149,131 +1258,79 @@ class Menus:
                                     #id, (c1, l1) = nextOut
                                     #outZone = deepcopy(self.board.sketcher.matrix[f"{c1},{l1}"]["link"])
                                     
-                                    if self.is_linked_to(nextOut, inFunc):
+                                    if self.linked(nextOut, inFunc):
                                         #for next in nextOut:
                                             for cow in self.chip_out:
                                                 id, pts = cow[0], cow[1:]
                                                 for pt in pts:
-                                                    if self.is_linked_to(nextOut, pt):
+                                                    if self.linked(nextOut, pt):
                                                         outZone =(id,[nextOut])
                                                         print("On passe à une autre sortie...")
                                                         ######## RAPPEL RECURSIF SUR OUTZONE ######################
-                                                        if outZone not in self.chip_out_checked:
-                                                            self.chip_out_checked += [outZone]
+                                                        checked_key = (id, tuple(nextOut))
+                                                        if checked_key not in self.chip_out_checked:
+                                                            self.chip_out_checked.add(checked_key)
                                                             isPinOut = False
                                                             for pinOut in self.io_out:
                                                                 id, [pinZoneOut] = pinOut
-                                                                if self.is_linked_to(pinZoneOut, pt):
+                                                                if self.linked(pinZoneOut, pt):
                                                                     #outPrev = self.mcu_pin[f"O{id[4:]}"]
                                                                     outPrev = f"O{no+1}"
-                                                                    constKey = 'val'
-                                                                    for c in chipSel:
-                                                                        if c == inFunc:
-                                                                            constKey = "sel"
-                                                                    for c in chipEnInv:
-                                                                        if c == inFunc:
-                                                                            constKey = "einv"
-                                                                    for c in chipEn:
-                                                                        if c == inFunc:
-                                                                            constKey = "enb"
-                                                                            
-                                                                    for c in chipOutTC:
-                                                                        if c == inFunc:
-                                                                            constKey = "TC"
-                                                                
+                                                                    constKey = out_key_map.get(inFunc, 'val')
                                                                     for c in chipOutInv:
                                                                         if c == pt:
                                                                             outPrev = "!" + outPrev
                                                                     isPinOut = True
-                                                                    inFuncConst += [{constKey:outPrev, "num":n, 'numO':no}] # [self.mcu_pin[f"O{id[4:]}"]] 
+                                                                    inFuncConst.append({constKey:outPrev, "num":n, 'numO':no}) # [self.mcu_pin[f"O{id[4:]}"]] 
                                                                     findNext = True
                                                             if not isPinOut:
                                                                 findNext, s = self.checkCloseCircuit(outZone,params)
-                                                                constKey = 'val'
-                                                                for c in chipSel:
-                                                                    if c == inFunc:
-                                                                        constKey = "sel"
-                                                                for c in chipEnInv:
-                                                                    if c == inFunc:
-                                                                        constKey = "einv"
-                                                                for c in chipEn:
-                                                                    if c == inFunc:
-                                                                        constKey = "enb"
-
-                                                                    for c in chipOutTC:
-                                                                        if c == inFunc:
-                                                                            constKey = "TC"
+                                                                constKey = out_key_map.get(inFunc, 'val')
 
                                                                 for c in chipOutInv:
                                                                     if c == pt:
                                                                         s = "!" + s 
                                                                         
-                                                                inFuncConst += [{constKey:s, "num":n, 'numO':no}]
-                                                                self.chip_out_script += [(s,outZone)]
+                                                                inFuncConst.append({constKey:s, "num":n, 'numO':no})
+                                                                self.chip_out_script.append((s,outZone))
                                                         else: 
                                                             # il faut voir si une sortie io n'existe pas sinon var temp
                                                             isPinOut = False
                                                             for pinOut in self.io_out:
                                                                 id, [pinZoneOut] = pinOut
-                                                                if self.is_linked_to(pinZoneOut, pt):
+                                                                if self.linked(pinZoneOut, pt):
                                                                     isPinOut = True
                                                                     #outPrev = self.mcu_pin[f"O{id[4:]}"]
                                                                     outPrev = f"O{no+1}"
-                                                                    constKey = 'val'
-                                                                    for c in chipSel:
-                                                                        if c == inFunc:
-                                                                            constKey = "sel"
-                                                                    for c in chipEnInv:
-                                                                        if c == inFunc:
-                                                                            constKey = "einv"
-                                                                    for c in chipEn:
-                                                                        if c == inFunc:
-                                                                            constKey = "enb"
-
-                                                                    for c in chipOutTC:
-                                                                        if c == inFunc:
-                                                                            constKey = "TC"
+                                                                    constKey = out_key_map.get(inFunc, 'val')
 
                                                                     for c in chipOutInv:
                                                                         if c == pt:
                                                                             outPrev = "!" + outPrev
                                                                             
-                                                                    inFuncConst += [{constKey:outPrev, "num":n, 'numO':no}]
+                                                                    inFuncConst.append({constKey:outPrev, "num":n, 'numO':no})
                                                             if not isPinOut:
                                                                 for coc in self.chip_out_script:
                                                                     if coc[1] == outZone:
                                                                         exp = coc[0]
-                                                                        constKey = 'val'
-                                                                        for c in chipSel:
-                                                                            if c == inFunc:
-                                                                                constKey = "sel"
-                                                                        for c in chipEnInv:
-                                                                            if c == inFunc:
-                                                                                constKey = "einv"
-                                                                        for c in chipEn:
-                                                                            if c == inFunc:
-                                                                                constKey = "enb"
-
-                                                                        for c in chipOutTC:
-                                                                            if c == inFunc:
-                                                                                constKey = "TC"
+                                                                        constKey = out_key_map.get(inFunc, 'val')
 
                                                                         for c in chipOutInv:
                                                                             if c == pt:
                                                                                 exp = "!" + exp
                                                                                 
-                                                                        inFuncConst += [{constKey:exp, "num":n, 'numO':no}] 
+                                                                        inFuncConst.append({constKey:exp, "num":n, 'numO':no}) 
                                                                         break
                                                             findNext = True
                                                         break
                             if not findIn and not findNext:
-                                self.in_outOC += [(id,inFunc)]
+                                self.in_outOC.append((id,inFunc))
                                 circuitClose = False
                         if findIn or findNext:
                             #self.script += ") "
                             script = self.decodeFunc(inFuncConst, fName) 
         if not findOut:
-            self.in_outOC += [ioOut]   
+            self.in_outOC.append(ioOut)   
             circuitClose = False 
         # if  not findIn and not findNext:
         #     circuitClose = False
@@ -1302,7 +1359,7 @@ class Menus:
         self.chip_out_wire, self.chip_outCC = [], []
         self.chip_in_wire = []
         self.in_outOC = []
-        self.chip_out_checked = []
+        self.chip_out_checked = set()  # (id, zone en tuple) des sorties de chip déjà parcourues
         self.chip_out_script = []
         
         chip_select = []
@@ -1325,7 +1382,7 @@ class Menus:
         self.varTempNum = 1
         self.varScript = []
 
-        self.show_correspondence_table(False)
+        self.compute_pin_mapping()
         for id, component in self.current_dict_circuit.items():
             if id[:6] == "_chip_":
                 (x, y) = component["pinUL_XY"]
@@ -1534,7 +1591,7 @@ class Menus:
             elif id[:4] == "_io_":  # [(col1, line1,col2,line2), ...]
                 (col, line) = component["coord"][0][0], component["coord"][0][1]
                 ioZone = deepcopy(self.board.sketcher.matrix[f"{col},{line}"]["link"])
-                if component["type"] == INPUT or component["type"] == CLOCK:
+                if component["type"] in (INPUT, CLOCK):
                     self.io_in += [(id, [ioZone])]
                 else:
                     self.io_out += [(id, [ioZone])]
@@ -1727,6 +1784,10 @@ class Menus:
                         and not self.io_outCC and not self.chip_outCC and not self.in_outOC:
             print("vérification du circuit fermé")
             self.script = ""
+            self.link_index = {}
+            # Index des entrées externes par point, la première zone qui couvre un point l'emporte
+            self.io_in_by_point = self.zones_by_point([zone for _, [zone] in self.io_in])
+            self.chip_in_wire_by_point = self.zones_by_point([zone for _, zone in self.chip_in_wire])
             params ={
                         "chip_select":chip_select, 
                         "chip_out_inv":chip_out_inv, 
@@ -1755,11 +1816,8 @@ class Menus:
                circuitClose, script = self.checkCloseCircuit(ioOut,params)
                if circuitClose :
                         print(f"le circuit est fermée sur la sortie {ioOut}")
-                        for s in self.varScript:
-                            self.script += s 
+                        self.script += "".join(self.varScript) + f"O{no+1} = {script}; \n"
                         self.varScript = []
-                        self.script += f"O{no+1}" + " = "
-                        self.script += f"{script}; \n"
                         print(f"script temp : {self.script}")
                else:    print(f"le circuit est ouvert sur la sortie {ioOut}")
 
@@ -34,6 +34,9 @@ from .chip_functions import (
 )
 from .circuit_util_elements import ConnectionPointID, FunctionRepresentation, Pin
 
+IO_LAYOUTS: dict[tuple, tuple] = {}
+"""Frozen io/select/enable pin layouts shared by every chip using the same pins (e.g. the 74HC00 family)."""
+
 
 @dataclass
 class Package:
@@ -271,40 +274,45 @@ class Chip:
 
         if self.functions:
             attr_dict["logicFunctionName"] = self.functions[0].__class__.__name__
-            attr_dict["io"] = [
-                (   [pin.pin_num for pin in func.input_pins], [pin.pin_num for pin in func.output_pins] + \
-                    [pin.pin_num for pin in getattr(func, 'inv_output_pins', [])]
+            io = tuple(
+                (   tuple(pin.pin_num for pin in func.input_pins), tuple(pin.pin_num for pin in func.output_pins) + \
+                    tuple(pin.pin_num for pin in getattr(func, 'inv_output_pins', []))
                 )
                 for func in self.functions
                 #if isinstance(func, LogicalFunction) and not isinstance(func, Mux) and not isinstance(func, Demux)
                 #if isinstance(func, LogicalFunction) or  isinstance(func, Mux) or isinstance(func, Demux) or isinstance(func, DFlipFlop)
-            ]
+            )
+            attr_dict["io"] = IO_LAYOUTS.setdefault(io, io)
             # if isinstance(self.functions, DFlipFlop):
             #     attr_dict["io"] = [([2], [5])]
-            attr_dict["io_select"] = [
-                [pin.pin_num for pin in func.select_pins]
+            select = tuple(
+                tuple(pin.pin_num for pin in func.select_pins)
                 for func in self.functions
                 #if isinstance(func, LogicalFunction) and not isinstance(func, Mux) and not isinstance(func, Demux)
                 if isinstance(func, Mux) 
-            ]
-            attr_dict["io_out_inv"] = [
-                [pin.pin_num for pin in func.inv_output_pins]
+            )
+            attr_dict["io_select"] = IO_LAYOUTS.setdefault(select, select)
+            out_inv = tuple(
+                tuple(pin.pin_num for pin in func.inv_output_pins)
                 for func in self.functions
                 #if isinstance(func, LogicalFunction) and not isinstance(func, Mux) and not isinstance(func, Demux)
                 if isinstance(func, Mux) or isinstance(func, DFlipFlop) 
-            ]
-            attr_dict["io_enable"] = [
-                [pin.pin_num for pin in func.enable_pins]
+            )
+            attr_dict["io_out_inv"] = IO_LAYOUTS.setdefault(out_inv, out_inv)
+            enable = tuple(
+                tuple(pin.pin_num for pin in func.enable_pins)
                 for func in self.functions
                 #if isinstance(func, LogicalFunction) and not isinstance(func, Mux) and not isinstance(func, Demux)
                 if isinstance(func, Mux) or  isinstance(func, Demux)
-            ]
-            attr_dict["io_enable_inv"] = [
-                [pin.pin_num for pin in func.inv_enable_pins]
+            )
+            attr_dict["io_enable"] = IO_LAYOUTS.setdefault(enable, enable)
+            enable_inv = tuple(
+                tuple(pin.pin_num for pin in func.inv_enable_pins)
                 for func in self.functions
                 #if isinstance(func, LogicalFunction) and not isinstance(func, Mux) and not isinstance(func, Demux)
                 if isinstance(func, Mux) or  isinstance(func, Demux)
-            ]
+            )
+            attr_dict["io_enable_inv"] = IO_LAYOUTS.setdefault(enable_inv, enable_inv)
             attr_dict["clock_pin"] = [
                 [(n,pin.pin_num) for pin in func.clock_pin]
                 for n,func in enumerate(self.functions) if getattr(func,"clock_type", "") == "RISING_EDGE"
@@ -428,17 +428,18 @@ class Sidebar:
             messagebox.showerror("Erreur", f"Puces inconnues : {chip_name}")
             return
 
-        chip_dict["internalFunc"] = self.sketcher.internal_func
-        chip_dict["open"] = 0
-        chip_dict["logicFunction"] = self.sketcher.draw_symb(chip_dict["logicFunctionName"])
+        chip_dict.update(
+            internalFunc=self.sketcher.internal_func,
+            logicFunction=self.sketcher.draw_symb(chip_dict["logicFunctionName"]),
+        )
 
-        chip_model = [
+        chip_model = (
             (
                 self.sketcher.draw_chip,
                 1,
                 chip_dict,
-            )
-        ]
+            ),
+        )
 
         # Draw the chip at the calculated exact position
         pin_x, pin_y = self.sketcher.xy_chip2pin(nearest_x, nearest_y)
@@ -478,7 +479,7 @@ class Sidebar:
         # Mark new holes as used
         for hole_id in occupied_holes:
             self.sketcher.matrix[hole_id]["state"] = USED
-        model_chip = [(chip_model, 1, {"XY": (nearest_x, nearest_y), "pinUL_XY": (pin_x, pin_y)})]
+        model_chip = ((chip_model, 1, {"XY": (nearest_x, nearest_y), "pinUL_XY": (pin_x, pin_y)}),)
         self.sketcher.circuit(nearest_x, nearest_y, scale=self.sketcher.scale_factor, model=model_chip)
         print(f"Chip {chip_name} placed at ({column}, {line}).")
 
@@ -14,7 +14,7 @@ from idlelib.tooltip import Hovertip  # type: ignore
 
 from component_sketch import ComponentSketcher
 from dataCDLT import INPUT, OUTPUT, FREE, CLOCK
-from utils import resource_path
+from utils import hex_rgb, resource_path, rgb_hex
 
 # if (os.name in ("posix", "darwin")) and "linux" not in platform.platform().lower():
 #     from tkinter import messagebox, colorchooser
@@ -186,8 +186,8 @@ class Toolbar:
             self.canvas.itemconfig(self.cursor_circle_id,fill=self.selected_color)
             if self.wire_start_point:
                 color =self.hex_to_rgb(self.selected_color )
-                encre = f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
-                contour = f"#{color[0]//2:02x}{color[1]//2:02x}{color[2]//2:02x}"
+                encre = rgb_hex(color[0], color[1], color[2])
+                contour = rgb_hex(color[0] // 2, color[1] // 2, color[2] // 2)
                 wire_body_tag = f"{self.wire_id}_body"
                 wire_body_shadow_tag = f"{self.wire_id}_body_shadow"
                 self.canvas.itemconfig(wire_body_tag,fill=encre)
@@ -304,13 +304,13 @@ class Toolbar:
                 self.sketcher.matrix[f"{coord[0][2]},{coord[0][3]}"]["state"] = FREE
                 color = self.hex_to_rgb(self.selected_color)
                 coord = [(coord[0][0], coord[0][1], col, line)]
-                model_wire = [
+                model_wire = (
                     (
                         self.sketcher.draw_wire,
                         1,
                         {"id": self.wire_info.wire_id, "color": color, "coord": coord, "matrix": self.sketcher.matrix},
-                    )
-                ]
+                    ),
+                )
                 x_origin, y_origin = self.sketcher.id_origins.get("xyOrigin", (0, 0))
                 self.sketcher.circuit(x_origin, y_origin, model=model_wire)
 
@@ -333,7 +333,7 @@ class Toolbar:
             # Wire placement logic
             if self.wire_info.start_point is None:
                 if self.sketcher.matrix[f"{col},{line}"]["state"] == FREE:
-                    model_wire = [
+                    model_wire = (
                         (
                             self.sketcher.draw_wire,
                             1,
@@ -342,8 +342,8 @@ class Toolbar:
                                 "coord": [(col, line, col, line)],
                                 "matrix": self.sketcher.matrix,
                             },
-                        )
-                    ]
+                        ),
+                    )
                     self.sketcher.wire_drag_data["creating_wire"] = True
                     self.sketcher.circuit(x_origin, y_origin, model=model_wire)
                     self.wire_info.wire_id = self.current_dict_circuit["last_id"]
@@ -366,13 +366,13 @@ class Toolbar:
             elif self.tool_mode == "Input":
                 type_const = INPUT
             if type_const is not None:
-                model_pin_io = [
+                model_pin_io = (
                     (
                         self.sketcher.draw_pin_io,
                         1,
                         {"color": self.selected_color, "type": type_const, "coord": [(col, line)], "matrix": self.sketcher.matrix},
-                    )
-                ]
+                    ),
+                )
                 self.sketcher.circuit(x_origin, y_origin, model=model_pin_io)
                 # Optionally deactivate after placement
                 # self.cancel_pin_io_placement()
@@ -389,5 +389,4 @@ class Toolbar:
         """
         Converts a hex color string to an RGB tuple.
         """
-        hex_color = hex_color.lstrip("#")
-        return tuple(int(hex_color[i : i + 2], 16) for i in (0, 2, 4))
+        return hex_rgb(hex_color)
@@ -1,7 +1,21 @@
 import os
+from functools import lru_cache
 
 
 def resource_path(relative_path: str) -> str:
     new_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), relative_path)
     print("new_path:", new_path)
     return new_path
+
+
+@lru_cache(maxsize=256)
+def rgb_hex(r: int, g: int, b: int) -> str:
+    """Return the "#rrggbb" string for the given color components."""
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+@lru_cache(maxsize=256)
+def hex_rgb(hex_color: str) -> tuple[int, int, int]:
+    """Return the (r, g, b) tuple for a "#rrggbb" string, shared by every caller using that color."""
+    hex_color = hex_color.lstrip("#")
+    return (int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16))